@@ -1,56 +1,88 @@
 import sys
-import re
-from PyQt6.QtGui import QAction, QPainter, QPen, QBrush, QColor, QFont
-from PyQt6.QtCore import QRect, Qt, QThread, pyqtSignal, QTimer
-from square import Cell
+from PyQt6.QtGui import QAction, QKeySequence, QPainter, QPen, QBrush, QColor, QFont
+from PyQt6.QtCore import (QRect, Qt, QThread, pyqtSignal, QTimer, QSequentialAnimationGroup,
+                          QVariantAnimation)
+from square import SudokuBoardView
+from chat_view import ChatTranscript
 from PyQt6.QtWidgets import *
 from sudoku import Sudoku
-from model import SudokuAI
+from solver import from_string, solve
+import dlx
+from puzzle_pool import DIFFICULTY_LEVELS, PuzzlePool, generate_puzzle
+from corpus import Corpus
+import importer
+from hints import HintEngine
+from markdown_stream import IncrementalMarkdown, markdown_to_html
+from board_index import BoardIndex
+from board import Board, snapshot_rows
+from journal import FLAG_HINT, Journal
+from autosave import AutosaveWriter, encode_game, load_game
 from config import config
 from settings_dialog import SettingsDialog
 import threading
 
-class SuccessOverlay(QWidget):
+class AnimatedOverlay(QWidget):
+    """Full-window overlay that fades in, holds, fades out and then deletes itself
+
+    The fades are QVariantAnimations, so the overlay only repaints while its
+    opacity is changing; during the hold a QPauseAnimation keeps the
+    animation timer idle.
+    """
+    FADE_IN_MS = 200
+    HOLD_MS = 600
+    FADE_OUT_MS = 270
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
         self.opacity = 0.0
-        self.phase = 0  # 0 = fade in, 1 = stay, 2 = fade out
-        
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_animation)
-        self.timer.start(16)  # ~60 FPS for smooth animation
-        
-        self.phase_timer = QTimer(self)
-        self.phase_timer.timeout.connect(self.next_phase)
-        self.phase_timer.start(800)  # Stay visible for 800ms
-    
-    def update_animation(self):
-        """Update animation state"""
-        if self.phase == 0:  # Fade in
-            self.opacity = min(1.0, self.opacity + 0.08)
-            if self.opacity >= 1.0:
-                self.phase = 1
-        elif self.phase == 2:  # Fade out
-            self.opacity = max(0.0, self.opacity - 0.06)
-            if self.opacity <= 0.0:
-                self.close_overlay()
         
-        self.update()
+        self.animation = QSequentialAnimationGroup(self)
+        self.animation.addAnimation(self.fade(0.0, 1.0, self.FADE_IN_MS))
+        self.animation.addPause(self.HOLD_MS)
+        self.animation.addAnimation(self.fade(1.0, 0.0, self.FADE_OUT_MS))
+        self.animation.finished.connect(self.close_overlay)
+        self.animation.start()
     
-    def next_phase(self):
-        """Move to next phase of animation"""
-        if self.phase == 1:
-            self.phase = 2
-            self.phase_timer.stop()
+    def fade(self, start, end, duration):
+        """Create an opacity animation step"""
+        animation = QVariantAnimation(self)
+        animation.setStartValue(start)
+        animation.setEndValue(end)
+        animation.setDuration(duration)
+        animation.valueChanged.connect(self.set_opacity)
+        return animation
+    
+    def set_opacity(self, opacity):
+        self.opacity = opacity
+        self.update()
     
     def paintEvent(self, event):
         if self.opacity <= 0:
             return
-            
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
+        self.paint_overlay(painter)
+    
+    def paint_overlay(self, painter):
+        """Draw the overlay at self.opacity; subclasses draw their content here"""
+    
+    def close_overlay(self):
+        try:
+            self.animation.stop()
+            self.hide()
+            self.deleteLater()
+        except:
+            pass
+
+class SuccessOverlay(AnimatedOverlay):
+    HOLD_MS = 600  # Visible for about 800ms before fading out
+    
+    def __init__(self, parent=None):
+        self.title_font = QFont("Arial", 24, QFont.Weight.Normal)
+        super().__init__(parent)
+    
+    def paint_overlay(self, painter):
         # Light green overlay with opacity
         overlay_color = QColor(46, 125, 50, int(40 * self.opacity))
         painter.fillRect(self.rect(), overlay_color)
@@ -58,63 +90,20 @@ class SuccessOverlay(QWidget):
         # Success text with fade
         text_color = QColor(46, 125, 50, int(255 * self.opacity))
         painter.setPen(QPen(text_color, 2))
-        font = QFont("Arial", 24, QFont.Weight.Normal)
-        painter.setFont(font)
+        painter.setFont(self.title_font)
         
         text_rect = QRect(0, self.height() // 2 - 30, self.width(), 60)
         painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, "Puzzle Completed!")
-    
-    def close_overlay(self):
-        try:
-            self.timer.stop()
-            if hasattr(self, 'phase_timer'):
-                self.phase_timer.stop()
-            self.hide()
-            self.deleteLater()
-        except:
-            pass
 
-class FailureOverlay(QWidget):
+class FailureOverlay(AnimatedOverlay):
+    HOLD_MS = 1000  # Visible for about 1200ms before fading out
+    
     def __init__(self, parent=None):
+        self.title_font = QFont("Arial", 20, QFont.Weight.Normal)
+        self.subtitle_font = QFont("Arial", 14, QFont.Weight.Normal)
         super().__init__(parent)
-        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
-        self.opacity = 0.0
-        self.phase = 0  # 0 = fade in, 1 = stay, 2 = fade out
-        
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_animation)
-        self.timer.start(16)  # ~60 FPS for smooth animation
-        
-        self.phase_timer = QTimer(self)
-        self.phase_timer.timeout.connect(self.next_phase)
-        self.phase_timer.start(1200)  # Stay visible for 1200ms
-    
-    def update_animation(self):
-        """Update animation state"""
-        if self.phase == 0:  # Fade in
-            self.opacity = min(1.0, self.opacity + 0.08)
-            if self.opacity >= 1.0:
-                self.phase = 1
-        elif self.phase == 2:  # Fade out
-            self.opacity = max(0.0, self.opacity - 0.06)
-            if self.opacity <= 0.0:
-                self.close_overlay()
-        
-        self.update()
     
-    def next_phase(self):
-        """Move to next phase of animation"""
-        if self.phase == 1:
-            self.phase = 2
-            self.phase_timer.stop()
-    
-    def paintEvent(self, event):
-        if self.opacity <= 0:
-            return
-            
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
+    def paint_overlay(self, painter):
         # Light red overlay with opacity
         overlay_color = QColor(198, 40, 40, int(30 * self.opacity))
         painter.fillRect(self.rect(), overlay_color)
@@ -122,49 +111,146 @@ class FailureOverlay(QWidget):
         # Error text with fade
         text_color = QColor(198, 40, 40, int(255 * self.opacity))
         painter.setPen(QPen(text_color, 2))
-        font = QFont("Arial", 20, QFont.Weight.Normal)
-        painter.setFont(font)
+        painter.setFont(self.title_font)
         
         text_rect = QRect(0, self.height() // 2 - 40, self.width(), 40)
         painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, "Puzzle has errors")
         
         # Subtitle
-        font = QFont("Arial", 14, QFont.Weight.Normal)
-        painter.setFont(font)
+        painter.setFont(self.subtitle_font)
         subtitle_rect = QRect(0, self.height() // 2 + 10, self.width(), 30)
         painter.drawText(subtitle_rect, Qt.AlignmentFlag.AlignCenter, "Please review your entries")
+
+class PoolRefillWorker(QThread):
+    """Background thread that tops up the puzzle pool"""
     
-    def close_overlay(self):
+    def __init__(self, pool, parent=None):
+        super().__init__(parent)
+        self.pool = pool
+        self._stop_requested = False
+    
+    def run(self):
+        self._stop_requested = False
+        self.pool.refill(should_stop=lambda: self._stop_requested)
+    
+    def stop(self):
+        """Ask the worker to finish after the puzzle it is generating"""
+        self._stop_requested = True
+
+class WarmupCancelled(Exception):
+    """Raised between warm-up stages once the worker has been asked to stop"""
+
+class AIWarmupWorker(QThread):
+    """Background thread that imports the AI stack and builds Arlo"""
+    stage = pyqtSignal(int, str)  # Generation, stage description
+    ready = pyqtSignal(int, object)  # Generation, SudokuAI
+    failed = pyqtSignal(int, str)  # Generation, error message
+    
+    def __init__(self, generation, parent=None):
+        super().__init__(parent)
+        self.generation = generation
+    
+    def report(self, text):
+        """Forward a stage, or abandon the warm-up if interruption was requested"""
+        if self.isInterruptionRequested():
+            raise WarmupCancelled()
+        self.stage.emit(self.generation, text)
+    
+    def run(self):
         try:
-            self.timer.stop()
-            if hasattr(self, 'phase_timer'):
-                self.phase_timer.stop()
-            self.hide()
-            self.deleteLater()
-        except:
+            self.report("Loading AI libraries...")
+            from model import SudokuAI  # Defer the langchain import until Arlo is needed
+            ai = SudokuAI(progress=self.report)
+            self.ready.emit(self.generation, ai)
+        except WarmupCancelled:
             pass
+        except Exception as e:
+            self.failed.emit(self.generation, str(e))
+
+class ImportWorker(QThread):
+    """Background thread that imports puzzle files into the corpus"""
+    progress = pyqtSignal(int, float)  # Records read, records per second
+    
+    def __init__(self, paths, corpus_path, parent=None):
+        super().__init__(parent)
+        self.paths = paths
+        self.corpus_path = corpus_path
+        self.stats = None  # ImportStats once done; None if cancelled or failed
+        self.error = None
+        self._cancel_requested = False
+    
+    def run(self):
+        def report(stats):
+            self.progress.emit(stats.read, stats.rate)
+            return not self._cancel_requested
+        
+        try:
+            self.stats = importer.import_to_corpus(self.paths, self.corpus_path, grade=True,
+                                                   progress=report, progress_every=100)
+        except importer.ImportCancelled:
+            pass
+        except (OSError, ValueError) as e:
+            self.error = str(e)
+    
+    def cancel(self):
+        """Stop at the next progress report; the existing corpus is left as it was"""
+        self._cancel_requested = True
 
 class MainWindow(QMainWindow):
     # Define custom signals for threading
-    hint_received = pyqtSignal(object)
-    hint_error = pyqtSignal(str)
-    chat_response = pyqtSignal(str)
-    chat_error = pyqtSignal(str)
+    stream_chunk = pyqtSignal(int, str)  # Stream id, text
+    stream_done = pyqtSignal(int)
+    stream_error = pyqtSignal(int, str)
+    hint_engine_ready = pyqtSignal(int, object)
     
     def __init__(self):
         super().__init__()
-        self._sudoku = Sudoku(3).difficulty(0.1)
-        self._solution = self._sudoku.solve()
+        self.box_size = 3  # 3 for 9x9, 4 for 16x16, 5 for 25x25
         self.selected_cell = None
         self.selected_number = None  # For number selection mode
         self.cells = []
-        self.ai = None  # Initialize AI lazily
+        self.ai = None  # Built by AIWarmupWorker
+        self.ai_worker = None
+        self.ai_generation = 0  # Bumped when settings change so a stale warm-up is dropped
+        self.pending_ai = []  # Requests made while Arlo is still starting
         self.game_mode = "classic"  # "classic" or "autocheck"
-        self.hint_cells = set()  # Track cells filled by AI hints
+        self.game_id = 0  # Bumped on every new game so stale background results are dropped
+        self.hint_engine = None  # Logical solve trace for offline hints
+        self.last_hint = None  # Most recent offline hint, for "Explain"
+        self.streams = {}  # Message id -> (markdown renderer, footer)
+        self.hint_stream_id = None  # Arlo hint in progress, if any
+        self.hint_engine_ready.connect(self.on_hint_engine_ready)
+        
+        # Resize events are coalesced into at most one grid layout per frame
+        self.grid_cell_size = None
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(16)
+        self.resize_timer.timeout.connect(self.adjust_grid_size)
+        
+        # Autosave: edits restart a short timer, the write happens on a background thread
+        self.autosave_path = config.config_dir / "autosave.bin"
+        self.autosave_writer = AutosaveWriter(self.autosave_path)
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(500)
+        self.autosave_timer.timeout.connect(self.autosave)
+        
+        # Resume the saved game, or start a new one
+        saved = load_game(self.autosave_path)
+        if saved:
+            board, solution, self.game_mode = saved
+            self.start_game(board, solution)
+        else:
+            puzzle = Sudoku(3).difficulty(0.1).board
+            self.new_game(puzzle, self.solve_puzzle(puzzle))
         self.interface_init()
-        self.sudoku_widget = QWidget()
-        self.grid = QGridLayout()
+        self.sudoku_widget = SudokuBoardView()
+        self.sudoku_widget.cellSelected.connect(self.on_cell_selected)
+        self.sudoku_widget.cellRightClicked.connect(self.on_cell_right_clicked)
         self.display_sudoku()
+        if self.game_mode == "autocheck":
+            self.update_all_cells()  # Show conflicts in a restored game
         self.ai_widget = self.create_ai_widget()
         main_layout = QHBoxLayout()
         main_widget = QWidget()
@@ -178,21 +264,112 @@ class MainWindow(QMainWindow):
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
         
         # Connect signals for threading
-        self.hint_received.connect(self.on_hint_received)
-        self.hint_error.connect(self.on_hint_error)
-        self.chat_response.connect(self.on_chat_response)
-        self.chat_error.connect(self.on_chat_error)
+        self.stream_chunk.connect(self.on_stream_chunk)
+        self.stream_done.connect(self.on_stream_done)
+        self.stream_error.connect(self.on_stream_error)
         
         # Make sure window can receive keyboard events
         self.sudoku_widget.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         
         # Graphics overlay for celebrations
         self.graphics_overlay = None
+        
+        # Curated puzzle corpus, used instead of generated puzzles when installed
+        self.corpus_path = config.config_dir / "puzzles.corpus"
+        self.open_corpus()
+        
+        # Ready-made puzzles per difficulty, refilled in the background
+        self.puzzle_pool = PuzzlePool(config.config_dir / "puzzle_pool.json")
+        self.pool_worker = PoolRefillWorker(self.puzzle_pool, self)
+        self.import_worker = None
+        self.refill_puzzle_pool()
+        
+        # Start Arlo once the event loop is running, i.e. after the window is shown
+        if config.get_ai_warmup():
+            QTimer.singleShot(0, self.start_ai_warmup)
+    
+    def open_corpus(self):
+        """Open the puzzle corpus if one is installed"""
+        self.corpus = None
+        if self.corpus_path.exists():
+            try:
+                self.corpus = Corpus(self.corpus_path)
+            except (ValueError, OSError) as e:
+                print(f"Error opening puzzle corpus: {e}")
+    
+    def import_puzzles(self):
+        """Import puzzle files (81-char lines, .sdk or .csv) into the corpus"""
+        if self.import_worker is not None and self.import_worker.isRunning():
+            return
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "Import Puzzles", "",
+            "Puzzle files (*.txt *.sdk *.csv);;All files (*)")
+        if not paths:
+            return
+        
+        progress = QProgressDialog("Importing puzzles...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Import Puzzles")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+        
+        # The corpus file is replaced, so release the memory map first
+        if self.corpus is not None:
+            self.corpus.close()
+            self.corpus = None
+        self.import_worker = ImportWorker(paths, str(self.corpus_path), self)
+        self.import_worker.progress.connect(
+            lambda read, rate: progress.setLabelText(f"{read} records read ({rate:.0f} records/sec)"))
+        self.import_worker.finished.connect(lambda: self.on_import_finished(progress))
+        progress.canceled.connect(self.import_worker.cancel)
+        self.import_worker.start()
+        progress.show()
+    
+    def on_import_finished(self, progress):
+        """Reopen the corpus and report the result of an import"""
+        progress.close()
+        self.open_corpus()
+        worker = self.import_worker
+        if worker.error:
+            QMessageBox.warning(self, "Import Puzzles", f"Import failed: {worker.error}")
+        elif worker.stats is not None:
+            stats = worker.stats
+            QMessageBox.information(
+                self, "Import Puzzles",
+                f"Imported {stats.imported} puzzles "
+                f"({stats.invalid} invalid, {stats.duplicates} duplicates skipped).")
+    
+    def refill_puzzle_pool(self):
+        """Start the refill worker if any difficulty is running low"""
+        if self.puzzle_pool.needs_refill() and not self.pool_worker.isRunning():
+            self.pool_worker.start(QThread.Priority.LowPriority)
+    
+    def closeEvent(self, event):
+        """Stop background work before the window closes"""
+        self.pool_worker.stop()
+        self.pool_worker.wait()
+        if self.import_worker is not None:
+            self.import_worker.cancel()
+            self.import_worker.wait()
+        if self.autosave_timer.isActive():
+            self.autosave_timer.stop()
+            self.autosave()
+        self.autosave_writer.close()
+        for worker in self.findChildren(AIWarmupWorker):
+            worker.requestInterruption()
+            worker.wait()  # Returns once the current stage or request is done
+        self.chat_display.log.close()
+        super().closeEvent(event)
+    
+    @property
+    def board_size(self):
+        """Number of rows (and columns) on the current board"""
+        return self.box_size * self.box_size
     
     def on_window_resize(self, event):
         """Handle window resize to adjust grid size"""
         super().resizeEvent(event)
-        self.adjust_grid_size()
+        if not self.resize_timer.isActive():
+            self.resize_timer.start()
         
         # Resize graphics overlay if it exists
         if self.graphics_overlay and self.graphics_overlay.isVisible():
@@ -207,32 +384,19 @@ class MainWindow(QMainWindow):
             
             # Make it square and leave some margin
             grid_size = min(available_width, available_height) - 50
-            cell_size = max(40, grid_size // 9)  # Minimum 40px per cell
-            
-            # Update cell sizes
-            if hasattr(self, 'cells') and self.cells:
-                for i in range(9):
-                    for j in range(9):
-                        if i < len(self.cells) and j < len(self.cells[i]):
-                            self.cells[i][j].setFixedSize(cell_size, cell_size)
+            min_cell_size = 40 if self.board_size <= 9 else 20  # Minimum px per cell
+            cell_size = max(min_cell_size, grid_size // self.board_size)
+            if (cell_size, self.board_size) == self.grid_cell_size:
+                return  # Nothing to relayout
+            self.grid_cell_size = (cell_size, self.board_size)
             
-            # Update sudoku widget size
-            total_size = cell_size * 9 + 10  # Add margin
+            # The board view derives its cell size from its own size
+            total_size = cell_size * self.board_size + 2 * SudokuBoardView.MARGIN
             self.sudoku_widget.setFixedSize(total_size, total_size)
     
     def markdown_to_html(self, text):
         """Convert basic markdown to HTML for display"""
-        # Convert **bold** to <b>bold</b>
-        text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)
-        # Convert *italic* to <i>italic</i>
-        text = re.sub(r'\*(.*?)\*', r'<i>\1</i>', text)
-        # Convert bullet points
-        text = re.sub(r'^- (.*?)$', r'• \1', text, flags=re.MULTILINE)
-        # Convert numbered lists
-        text = re.sub(r'^(\d+)\. (.*?)$', r'<b>\1.</b> \2', text, flags=re.MULTILINE)
-        # Convert line breaks
-        text = text.replace('\n', '<br>')
-        return text
+        return markdown_to_html(text)
     def interface_init(self):
         self.setWindowTitle("Super Sudoku")
         easy_generate = QAction("Easy", self)
@@ -251,6 +415,36 @@ class MainWindow(QMainWindow):
         new_menu_item.addAction(medium_generate)
         new_menu_item.addSeparator()
         new_menu_item.addAction(difficult_generate)
+        new_menu_item.addSeparator()
+        
+        # Larger boards, cut from a shuffled solution pattern
+        large_generate = QAction("16x16", self)
+        large_generate.triggered.connect(lambda: self.large_generate(4))
+        new_menu_item.addAction(large_generate)
+        huge_generate = QAction("25x25", self)
+        huge_generate.triggered.connect(lambda: self.large_generate(5))
+        new_menu_item.addAction(huge_generate)
+        new_menu_item.addSeparator()
+        
+        # Load external puzzle files into the corpus
+        import_puzzles = QAction("Import Puzzles...", self)
+        import_puzzles.triggered.connect(self.import_puzzles)
+        new_menu_item.addAction(import_puzzles)
+        
+        # Move history
+        edit_menu = menu.addMenu("Edit")
+        undo_action = QAction("Undo", self)
+        undo_action.setShortcut(QKeySequence.StandardKey.Undo)
+        undo_action.triggered.connect(self.undo_move)
+        edit_menu.addAction(undo_action)
+        redo_action = QAction("Redo", self)
+        redo_action.setShortcuts([QKeySequence.StandardKey.Redo, QKeySequence("Ctrl+Y")])
+        redo_action.triggered.connect(self.redo_move)
+        edit_menu.addAction(redo_action)
+        edit_menu.addSeparator()
+        jump_action = QAction("Go to Move...", self)
+        jump_action.triggered.connect(self.jump_to_move)
+        edit_menu.addAction(jump_action)
         
         # Add settings menu
         settings_action = QAction("Settings...", self)
@@ -262,11 +456,12 @@ class MainWindow(QMainWindow):
         classic_mode = QAction("Classic", self)
         classic_mode.triggered.connect(lambda: self.set_mode("classic"))
         classic_mode.setCheckable(True)
-        classic_mode.setChecked(True)
+        classic_mode.setChecked(self.game_mode == "classic")
         
         autocheck_mode = QAction("Autocheck", self)
         autocheck_mode.triggered.connect(lambda: self.set_mode("autocheck"))
         autocheck_mode.setCheckable(True)
+        autocheck_mode.setChecked(self.game_mode == "autocheck")
         
         mode_menu.addAction(classic_mode)
         mode_menu.addAction(autocheck_mode)
@@ -277,49 +472,15 @@ class MainWindow(QMainWindow):
         screen_geometry = QApplication.primaryScreen().availableGeometry()
         self.setGeometry(screen_geometry)
     def display_sudoku(self):
-        # Clear existing cells
-        for i in reversed(range(self.grid.count())):
-            self.grid.itemAt(i).widget().setParent(None)
-        self.cells = []
-        
-        # Store original puzzle state to distinguish given numbers (only on first call)
-        if not hasattr(self, '_original_board'):
-            self._original_board = [row[:] for row in self._sudoku.board]
-        
-        # Create new cells
-        for i in range(9):
-            row = []
-            for j in range(9):
-                original_val = self._original_board[i][j]
-                is_given = original_val is not None and original_val != 0
-                current_val = self._sudoku.board[i][j]
-                # Convert None to 0 for display
-                display_val = current_val if current_val is not None else 0
-                cell = Cell(display_val, i, j, is_given)
-                cell.cellSelected.connect(self.on_cell_selected)
-                cell.cellRightClicked.connect(self.on_cell_right_clicked)
-                self.grid.addWidget(cell, i, j)
-                row.append(cell)
-            self.cells.append(row)
-        
-        # Set grid spacing and styling - no spacing for tight grid
-        self.grid.setSpacing(0)
-        self.grid.setContentsMargins(5, 5, 5, 5)
-        self.sudoku_widget.setLayout(self.grid)
-        self.sudoku_widget.setStyleSheet("""
-            QWidget {
-                background-color: #f0f0f0;
-                border: 3px solid #333;
-            }
-        """)
-        # Make grid much larger - will be set dynamically based on available space
+        """Show the current board in the board view"""
+        self.sudoku_widget.load(self.board)
+        self.cells = self.sudoku_widget.cells
         self.adjust_grid_size()  # Initial sizing
     
     def on_cell_selected(self, row, col):
         # If in number selection mode, fill the cell with selected number
         if self.selected_number is not None:
-            original_value = self._original_board[row][col]
-            if (original_value is None or original_value == 0) and (row, col) not in self.hint_cells:  # Only edit empty, non-hint cells
+            if self.board.is_editable(row, col):  # Only edit empty, non-hint cells
                 self.set_cell_value(row, col, self.selected_number)
             return
         
@@ -348,8 +509,7 @@ class MainWindow(QMainWindow):
     def on_cell_right_clicked(self, row, col):
         """Handle right-click on cell to erase it"""
         # Only allow erasing if it's not a given number and not a hint cell
-        original_value = self._original_board[row][col]
-        if (original_value is None or original_value == 0) and (row, col) not in self.hint_cells:
+        if self.board.is_editable(row, col):
             self.set_cell_value(row, col, 0)  # Erase the cell
             
             # Clear any selections
@@ -366,10 +526,15 @@ class MainWindow(QMainWindow):
         self.classic_action.setChecked(mode == "classic")
         self.autocheck_action.setChecked(mode == "autocheck")
         self.update_all_cells()  # Refresh cells to apply mode changes
+        self.schedule_autosave()
     
     def set_cell_value(self, row, col, value):
         """Set a cell value and handle validation"""
-        self._sudoku.board[row][col] = value if value != 0 else None
+        old = self.board.get(row, col)
+        self.board.set(row, col, value)
+        self.board_index.set(row, col, value)
+        if old != value:
+            self.journal.record(row, col, old, value)
         self.cells[row][col].set_value(value, is_user_input=True)
         
         # In autocheck mode, validate the move
@@ -382,6 +547,7 @@ class MainWindow(QMainWindow):
             # Clear error highlighting when cell is emptied
             self.cells[row][col].set_error(False)
         self.cells[row][col].update_style()
+        self.schedule_autosave()
         # Check for completion
         self.check_completion()
         
@@ -391,41 +557,73 @@ class MainWindow(QMainWindow):
     
     def is_valid_move(self, row, col, value):
         """Check if a move is valid according to Sudoku rules"""
-        # Check row
-        for c in range(9):
-            if c != col and self._sudoku.board[row][c] == value:
-                return False
-        
-        # Check column
-        for r in range(9):
-            if r != row and self._sudoku.board[r][col] == value:
-                return False
-        
-        # Check 3x3 box
-        box_row, box_col = 3 * (row // 3), 3 * (col // 3)
-        for r in range(box_row, box_row + 3):
-            for c in range(box_col, box_col + 3):
-                if (r != row or c != col) and self._sudoku.board[r][c] == value:
-                    return False
-        
-        return True
+        return self.board_index.is_valid_move(row, col, value)
+    
+    def refresh_cell(self, row, col):
+        """Sync one cell widget with the board after an undo or redo"""
+        value = self.board.get(row, col)
+        self.board_index.set(row, col, value)
+        cell = self.cells[row][col]
+        cell.set_hint(self.board.is_hint(row, col))
+        cell.set_value(value, is_user_input=not self.board.is_given(row, col))
+        if self.game_mode == "autocheck":
+            self.refresh_errors(row, col)
+        self.schedule_autosave()
+        if self.selected_number is not None:
+            self.set_number_selection(self.selected_number)
+    
+    def refresh_errors(self, row, col):
+        """Recompute conflict highlighting for a cell and its row, column and box peers"""
+        size, box = self.board_size, self.box_size
+        box_row, box_col = row - row % box, col - col % box
+        peers = {(row, j) for j in range(size)} | {(i, col) for i in range(size)}
+        peers |= {(box_row + i, box_col + j) for i in range(box) for j in range(box)}
+        with self.sudoku_widget.batch():
+            for i, j in peers:
+                self.cells[i][j].set_error(self.board_index.has_conflict(i, j))
+    
+    def undo_move(self):
+        """Revert the last move"""
+        move = self.journal.undo()
+        if move:
+            self.refresh_cell(*move[:2])
+    
+    def redo_move(self):
+        """Reapply the last undone move"""
+        move = self.journal.redo()
+        if move:
+            self.refresh_cell(*move[:2])
+            self.check_completion()
+    
+    def jump_to_move(self):
+        """Rewind or replay the game to a chosen move number"""
+        total = len(self.journal)
+        move, ok = QInputDialog.getInt(self, "Go to Move", f"Move (0-{total}):",
+                                       self.journal.position, 0, total)
+        if not ok:
+            return
+        self.journal.jump_to(move)
+        self.board_index = BoardIndex(self.board.to_rows())
+        with self.sudoku_widget.batch():
+            for i in range(self.board_size):
+                for j in range(self.board_size):
+                    self.cells[i][j].set_hint(self.board.is_hint(i, j))
+            self.update_all_cells()
+        self.schedule_autosave()
+        self.check_completion()
     
     def update_all_cells(self):
-        """Update all cells to reflect current state"""
-        for i in range(9):
-            for j in range(9):
-                current_val = self._sudoku.board[i][j]
-                display_val = current_val if current_val is not None else 0
-                self.cells[i][j].set_value(display_val, is_user_input=self._original_board[i][j] is None or self._original_board[i][j] == 0)
-                
-                # Apply error highlighting in autocheck mode
-                if self.game_mode == "autocheck" and display_val != 0:
-                    if not self.is_valid_move(i, j, display_val):
-                        self.cells[i][j].set_error(True)
+        """Update all cells to reflect current state; only changed cells are repainted"""
+        with self.sudoku_widget.batch():
+            for i in range(self.board_size):
+                for j in range(self.board_size):
+                    self.cells[i][j].set_value(self.board.get(i, j), is_user_input=not self.board.is_given(i, j))
+                    
+                    # Apply error highlighting in autocheck mode
+                    if self.game_mode == "autocheck":
+                        self.cells[i][j].set_error(self.board_index.has_conflict(i, j))
                     else:
                         self.cells[i][j].set_error(False)
-                else:
-                    self.cells[i][j].set_error(False)
     
     def keyPressEvent(self, event):
         key = event.key()
@@ -437,26 +635,24 @@ class MainWindow(QMainWindow):
             
             if key == Qt.Key.Key_Up and row > 0:
                 new_row = row - 1
-            elif key == Qt.Key.Key_Down and row < 8:
+            elif key == Qt.Key.Key_Down and row < self.board_size - 1:
                 new_row = row + 1
             elif key == Qt.Key.Key_Left and col > 0:
                 new_col = col - 1
-            elif key == Qt.Key.Key_Right and col < 8:
+            elif key == Qt.Key.Key_Right and col < self.board_size - 1:
                 new_col = col + 1
             
             if (new_row, new_col) != (row, col):
                 self.on_cell_selected(new_row, new_col)
             return
         
-        # Handle number keys
-        if Qt.Key.Key_1 <= key <= Qt.Key.Key_9:
-            number = key - Qt.Key.Key_1 + 1
-            
+        # Handle number keys (and letters A-P for values 10-25 on large boards)
+        number = self.key_to_value(key)
+        if number is not None:
             if self.selected_cell:
                 # Cell is selected - enter number in cell
                 row, col = self.selected_cell
-                original_value = self._original_board[row][col]
-                if (original_value is None or original_value == 0) and (row, col) not in self.hint_cells:  # Only edit empty, non-hint cells
+                if self.board.is_editable(row, col):  # Only edit empty, non-hint cells
                     self.set_cell_value(row, col, number)
             else:
                 # No cell selected - enter number selection mode
@@ -472,8 +668,7 @@ class MainWindow(QMainWindow):
         if key in [Qt.Key.Key_Delete, Qt.Key.Key_Backspace, Qt.Key.Key_0]:
             if self.selected_cell:
                 row, col = self.selected_cell
-                original_value = self._original_board[row][col]
-                if (original_value is None or original_value == 0) and (row, col) not in self.hint_cells:  # Only edit empty, non-hint cells
+                if self.board.is_editable(row, col):  # Only edit empty, non-hint cells
                     self.set_cell_value(row, col, 0)
             return
         
@@ -489,11 +684,18 @@ class MainWindow(QMainWindow):
         
         super().keyPressEvent(event)
     
+    def key_to_value(self, key):
+        """Map a key to a cell value on the current board, or None"""
+        if Qt.Key.Key_1 <= key <= Qt.Key.Key_9:
+            number = key - Qt.Key.Key_1 + 1
+        elif Qt.Key.Key_A <= key <= Qt.Key.Key_P:
+            number = key - Qt.Key.Key_A + 10
+        else:
+            return None
+        return number if number <= self.board_size else None
+    
     def set_number_selection(self, number):
         """Enter number selection mode"""
-        # First clear any existing number highlighting
-        self.clear_number_selection()
-        
         self.selected_number = number
         
         # Clear cell selection
@@ -502,31 +704,34 @@ class MainWindow(QMainWindow):
             self.cells[row][col].set_selected(False)
             self.selected_cell = None
         
-        # Highlight all cells with this number
-        for i in range(9):
-            for j in range(9):
-                if self.cells[i][j].value == number:
-                    self.cells[i][j].set_highlighted(True)
+        # Highlight all cells with this number in one pass, so cells that stay
+        # highlighted (or unhighlighted) are not repainted
+        with self.sudoku_widget.batch():
+            for row in self.cells:
+                for cell in row:
+                    cell.set_highlighted(cell.value == number)
     
     def clear_number_selection(self):
         """Exit number selection mode"""
         self.selected_number = None
         
         # Clear all highlighting
-        for i in range(9):
-            for j in range(9):
-                self.cells[i][j].set_highlighted(False)
+        with self.sudoku_widget.batch():
+            for row in self.cells:
+                for cell in row:
+                    cell.set_highlighted(False)
     
     def check_completion(self):
         """Check if puzzle is completed and show appropriate message"""
         # Check if all cells are filled
-        for i in range(9):
-            for j in range(9):
-                if self._sudoku.board[i][j] is None:
-                    return  # Not complete yet
+        if not self.board_index.is_complete():
+            return  # Not complete yet
         
         # All cells filled - check if solution is correct
         if self.is_solution_correct():
+            # A finished game is not worth resuming
+            self.autosave_timer.stop()
+            self.autosave_writer.clear()
             self.show_completion_message(True)
         else:
             self.show_completion_message(False)
@@ -534,12 +739,7 @@ class MainWindow(QMainWindow):
     def is_solution_correct(self):
         """Check if the current board state is a valid solution"""
         try:
-            for i in range(9):
-                for j in range(9):
-                    value = self._sudoku.board[i][j]
-                    if value is None or not self.is_valid_move(i, j, value):
-                        return False
-            return True
+            return self.board_index.is_solved()
         except Exception as e:
             print(f"Error checking solution: {e}")
             return False
@@ -591,12 +791,9 @@ class MainWindow(QMainWindow):
         ai_label.setStyleSheet("font-weight: bold; font-size: 14px;")
         layout.addWidget(ai_label)
         
-        # Chat display area
-        self.chat_display = QTextEdit()
-        self.chat_display.setReadOnly(True)
+        # Chat display area; older messages are kept on disk, not in the document
+        self.chat_display = ChatTranscript(config.config_dir / "chat_history.jsonl")
         self.chat_display.setMinimumHeight(500)
-        # Enable markdown-like formatting
-        self.chat_display.setHtml("")
         layout.addWidget(self.chat_display)
         
         # Chat input
@@ -613,6 +810,12 @@ class MainWindow(QMainWindow):
         self.hint_button.clicked.connect(self.get_hint)
         button_layout.addWidget(self.hint_button)
         
+        self.explain_button = QPushButton("Explain")
+        self.explain_button.setToolTip("Ask Arlo to explain the last hint in more detail")
+        self.explain_button.clicked.connect(self.explain_hint)
+        self.explain_button.setEnabled(False)
+        button_layout.addWidget(self.explain_button)
+        
         send_button = QPushButton("Send")
         send_button.clicked.connect(self.send_chat_message)
         button_layout.addWidget(send_button)
@@ -629,150 +832,267 @@ class MainWindow(QMainWindow):
         widget.setMaximumWidth(600)
         return widget
     
-    def initialize_ai(self):
-        """Initialize AI model (lazy loading)"""
-        if not self.ai:
+    def start_ai_warmup(self):
+        """Build Arlo on a background thread unless it is ready or already starting
+        
+        Returns False if there is no API key, so nothing will start.
+        """
+        if self.ai or self.ai_starting():
+            return True
+        if not config.has_valid_api_key():
+            self.ai_status.setText("API key not configured")
+            self.ai_status.setStyleSheet("color: red; font-size: 10px;")
+            return False
+        
+        self.ai_status.setText("Initializing Arlo...")
+        self.ai_status.setStyleSheet("color: gray; font-size: 10px;")
+        self.ai_worker = AIWarmupWorker(self.ai_generation, self)
+        self.ai_worker.stage.connect(self.on_ai_stage)
+        self.ai_worker.ready.connect(self.on_ai_ready)
+        self.ai_worker.failed.connect(self.on_ai_failed)
+        self.ai_worker.start()
+        return True
+    
+    def ai_starting(self):
+        """Whether a warm-up with the current settings is in progress"""
+        worker = self.ai_worker
+        return worker is not None and worker.generation == self.ai_generation and worker.isRunning()
+    
+    def with_ai(self, request):
+        """Run request once Arlo is ready: now if it is, otherwise after the warm-up
+        
+        Returns False if Arlo can't start (no API key), in which case the
+        request is dropped.
+        """
+        if self.ai:
+            request()
+            return True
+        if not self.start_ai_warmup():
+            self.show_api_key_required_message()
+            return False
+        self.pending_ai.append(request)
+        return True
+    
+    def on_ai_stage(self, generation, text):
+        """Show warm-up progress"""
+        if generation == self.ai_generation:
+            self.ai_status.setText(f"Starting Arlo: {text}")
+    
+    def on_ai_ready(self, generation, ai):
+        """Install the finished AI and run the requests queued meanwhile"""
+        if generation != self.ai_generation:
+            return  # Built with settings that have since changed
+        self.ai = ai
+        self.ai_status.setText("Arlo ready")
+        self.ai_status.setStyleSheet("color: green; font-size: 10px;")
+        pending, self.pending_ai = self.pending_ai, []
+        for request in pending:
+            request()
+    
+    def on_ai_failed(self, generation, error_msg):
+        """Report a failed warm-up and drop the queued requests"""
+        if generation != self.ai_generation:
+            return
+        self.pending_ai = []
+        self.reset_hint_button()
+        if "API key not configured" in error_msg:
+            self.ai_status.setText("API key required")
+            self.ai_status.setStyleSheet("color: red; font-size: 10px;")
+            self.show_api_key_required_message()
+        else:
+            self.ai_status.setText(f"Arlo Error: {error_msg}")
+            self.ai_status.setStyleSheet("color: red; font-size: 10px;")
+    
+    def prepare_hints(self):
+        """Compute the logical solve trace for a new puzzle in the background"""
+        self.game_id += 1
+        self.hint_engine = None
+        self.last_hint = None
+        if hasattr(self, 'explain_button'):
+            self.explain_button.setEnabled(False)
+        if self.box_size != 3:
+            return  # Offline hints only cover 9x9 boards
+        
+        game_id = self.game_id
+        puzzle = self.board.given_rows()
+        solution = self.solution
+        
+        def trace_worker():
             try:
-                # Check if API key is configured
-                if not config.has_valid_api_key():
-                    self.ai_status.setText("API key not configured")
-                    self.ai_status.setStyleSheet("color: red; font-size: 10px;")
-                    self.show_api_key_required_message()
-                    return
-                
-                self.ai_status.setText("Initializing Arlo...")
-                self.ai = SudokuAI()
-                self.ai_status.setText("Arlo ready")
-                self.ai_status.setStyleSheet("color: green; font-size: 10px;")
+                self.hint_engine_ready.emit(game_id, HintEngine(puzzle, solution))
             except Exception as e:
-                error_msg = str(e)
-                if "API key not configured" in error_msg:
-                    self.ai_status.setText("API key required")
-                    self.ai_status.setStyleSheet("color: red; font-size: 10px;")
-                    self.show_api_key_required_message()
-                else:
-                    self.ai_status.setText(f"Arlo Error: {error_msg}")
-                    self.ai_status.setStyleSheet("color: red; font-size: 10px;")
+                print(f"Error computing hint trace: {e}")
+        
+        thread = threading.Thread(target=trace_worker)
+        thread.daemon = True
+        thread.start()
+    
+    def on_hint_engine_ready(self, game_id, engine):
+        """Keep the background hint trace if it still belongs to the current game"""
+        if game_id == self.game_id and self.hint_engine is None:
+            self.hint_engine = engine
     
     def get_hint(self):
-        """Get a hint from Arlo"""
-        self.initialize_ai()
-        if not self.ai:
+        """Get an instant hint from the puzzle's logical solve trace"""
+        if self.box_size != 3:
+            self.get_ai_hint()
             return
-            
-        self.hint_button.setText("Getting hint...")
-        self.hint_button.setEnabled(False)
         
-        # Add loading message to chat
-        self.chat_display.append(f"<i>Arlo is analyzing the puzzle...</i>")
+        if self.hint_engine is None:
+            # Trace not ready yet; building it takes a few milliseconds
+            self.hint_engine = HintEngine(self.board.given_rows(), self.solution)
         
-        # Run AI hint in separate thread
-        def hint_worker():
-            try:
-                hint_data = self.ai.get_hint_with_position(self._sudoku.board, self._solution.board)
-                self.hint_received.emit(hint_data)
-            except Exception as e:
-                self.hint_error.emit(str(e))
+        hint = self.hint_engine.next_hint(self.board.to_rows())
+        if hint is None:
+            self.chat_display.add_message("<i>The puzzle is already solved.</i>")
+            return
         
-        thread = threading.Thread(target=hint_worker)
-        thread.daemon = True
-        thread.start()
+        self.apply_hint(hint)
+        self.last_hint = hint
+        self.explain_button.setEnabled(True)
     
-    def on_hint_received(self, hint_data):
-        """Handle hint received from Arlo"""
-        # Remove the loading message
-        cursor = self.chat_display.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        cursor.select(cursor.SelectionType.BlockUnderCursor)
-        cursor.removeSelectedText()
-        cursor.deletePreviousChar()  # Remove newline
+    def explain_hint(self):
+        """Ask Arlo to explain the last offline hint in more detail"""
+        if not self.last_hint:
+            return
+        
+        hint = self.last_hint
         
+        def explain():
+            rows = snapshot_rows(self.board.snapshot())
+            stream_id = self.start_stream("Arlo:", "Arlo is thinking...")
+            self.run_stream(stream_id, lambda: self.ai.explain_hint_stream(
+                rows, hint['row'], hint['col'], hint['value'], hint['technique']))
+        
+        self.with_ai(explain)
+    
+    def get_ai_hint(self):
+        """Get a hint from Arlo, once it has started"""
+        if self.with_ai(self.request_ai_hint):
+            self.hint_button.setText("Getting hint...")
+            self.hint_button.setEnabled(False)
+    
+    def request_ai_hint(self):
+        """Place Arlo's hint move and stream its explanation"""
+        # The move itself is known right away; only the explanation comes from Arlo
+        rows = snapshot_rows(self.board.snapshot())
+        move = self.ai.find_hint_move(rows, self.solution)
+        footer = None
+        if move:
+            row, col, value = move
+            self.place_hint(row, col, value)
+            footer = f"<i>Applied to row {row+1}, column {col+1}: {value}</i>"
+        
+        self.hint_stream_id = self.start_stream("Arlo's Hint:", "Arlo is analyzing the puzzle...", footer)
+        self.run_stream(self.hint_stream_id, lambda: self.ai.hint_stream(rows, move))
+    
+    def place_hint(self, row, col, value):
+        """Fill in a hinted cell"""
+        old = self.board.get(row, col)
+        self.board.set(row, col, value)
+        self.board.set_hint(row, col)  # Mark as hint cell
+        self.board_index.set(row, col, value)
+        self.journal.record(row, col, old, value, FLAG_HINT)
+        self.schedule_autosave()
+        self.cells[row][col].set_value(value, is_user_input=False)
+        self.cells[row][col].set_hint(True)
+    
+    def apply_hint(self, hint_data):
+        """Fill in a hinted cell and show its explanation"""
         try:
             if isinstance(hint_data, dict) and 'row' in hint_data and 'col' in hint_data and 'value' in hint_data:
-                # AI provided a specific move
+                # Hint with a specific move
                 row, col, value = hint_data['row'], hint_data['col'], hint_data['value']
                 explanation = hint_data.get('explanation', 'Arlo suggested this move.')
-                
-                # Update the cell with the hint
-                self._sudoku.board[row][col] = value
-                self.cells[row][col].set_value(value, is_user_input=False)
-                self.cells[row][col].set_hint(True)  # Mark as hint cell
-                self.hint_cells.add((row, col))
+                self.place_hint(row, col, value)
                 
                 formatted_explanation = self.markdown_to_html(explanation)
-                self.chat_display.append(f"<b>Arlo's Hint:</b><br>{formatted_explanation}")
-                self.chat_display.append(f"<i>Applied to row {row+1}, column {col+1}: {value}</i>")
+                self.chat_display.add_message(f"<b>Arlo's Hint:</b><br>{formatted_explanation}")
+                self.chat_display.add_message(f"<i>Applied to row {row+1}, column {col+1}: {value}</i>")
             else:
                 # AI provided general advice
                 formatted_hint = self.markdown_to_html(str(hint_data))
-                self.chat_display.append(f"<b>Arlo's Hint:</b><br>{formatted_hint}")
+                self.chat_display.add_message(f"<b>Arlo's Hint:</b><br>{formatted_hint}")
         except Exception as e:
-            self.chat_display.append(f"<b>Error processing hint:</b> {str(e)}")
-        finally:
-            self.hint_button.setText("Get Hint")
-            self.hint_button.setEnabled(True)
-    
-    def on_hint_error(self, error_msg):
-        """Handle hint error"""
-        # Remove the loading message
-        cursor = self.chat_display.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        cursor.select(cursor.SelectionType.BlockUnderCursor)
-        cursor.removeSelectedText()
-        cursor.deletePreviousChar()  # Remove newline
-        
-        self.chat_display.append(f"<b>Error:</b> {error_msg}")
-        self.hint_button.setText("Get Hint")
-        self.hint_button.setEnabled(True)
+            self.chat_display.add_message(f"<b>Error processing hint:</b> {str(e)}")
     
     def send_chat_message(self):
         """Send a chat message to Arlo"""
         message = self.chat_input.toPlainText().strip()
         if not message:
             return
-            
-        self.initialize_ai()
-        if not self.ai:
-            return
         
-        self.chat_display.append(f"<b>You:</b> {message}")
-        self.chat_input.clear()
-        self.chat_display.append(f"<i>Arlo is thinking...</i>")
+        def answer():
+            # Stream the answer computed on an immutable snapshot of the board
+            rows = snapshot_rows(self.board.snapshot())
+            solution = self.solution
+            stream_id = self.start_stream("Arlo:", "Arlo is thinking...")
+            self.run_stream(stream_id, lambda: self.ai.chat_stream(message, rows, solution))
         
-        # Run AI chat in separate thread
-        def chat_worker():
+        self.chat_display.add_message(f"<b>You:</b> {message}")
+        self.chat_input.clear()
+        self.with_ai(answer)  # Answers right away when Arlo is ready, so show the question first
+    
+    def start_stream(self, title, placeholder, footer=None):
+        """Add a message whose body will arrive in chunks; return its message id
+        
+        The placeholder is shown as the initial tail, so the first chunk
+        replaces it. footer is added below the message once the stream is done.
+        """
+        message_id = self.chat_display.start_stream(f"<b>{title}</b><br>", f"<i>{placeholder}</i>")
+        self.streams[message_id] = (IncrementalMarkdown(), footer)
+        return message_id
+    
+    def run_stream(self, stream_id, make_stream):
+        """Consume a response stream on a worker thread, forwarding chunks as signals"""
+        def stream_worker():
             try:
-                response = self.ai.chat(message, self._sudoku.board, self._solution.board)
-                self.chat_response.emit(response)
+                for chunk in make_stream():
+                    self.stream_chunk.emit(stream_id, chunk)
+                self.stream_done.emit(stream_id)
             except Exception as e:
-                self.chat_error.emit(str(e))
+                self.stream_error.emit(stream_id, str(e))
         
-        thread = threading.Thread(target=chat_worker)
+        thread = threading.Thread(target=stream_worker)
         thread.daemon = True
         thread.start()
     
-    def on_chat_response(self, response):
-        """Handle chat response from Arlo"""
-        # Remove the "thinking" message
-        cursor = self.chat_display.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        cursor.select(cursor.SelectionType.BlockUnderCursor)
-        cursor.removeSelectedText()
-        cursor.deletePreviousChar()  # Remove newline
-        
-        formatted_response = self.markdown_to_html(response)
-        self.chat_display.append(f"<b>Arlo:</b><br>{formatted_response}")
-    
-    def on_chat_error(self, error_msg):
-        """Handle chat error"""
-        # Remove the "thinking" message
-        cursor = self.chat_display.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        cursor.select(cursor.SelectionType.BlockUnderCursor)
-        cursor.removeSelectedText()
-        cursor.deletePreviousChar()  # Remove newline
-        
-        self.chat_display.append(f"<b>Error:</b> {error_msg}")
+    def on_stream_chunk(self, stream_id, text):
+        """Render a streamed chunk; only the unfinished last line is re-formatted"""
+        if stream_id not in self.streams:
+            return
+        renderer, _ = self.streams[stream_id]
+        self.chat_display.update_stream(stream_id, *renderer.feed(text))
+    
+    def on_stream_done(self, stream_id):
+        """Finish a streamed message"""
+        renderer, footer = self.streams.pop(stream_id, (None, None))
+        if renderer is None:
+            return
+        html = renderer.finish()
+        if footer:
+            html += f"<br>{footer}"
+        self.chat_display.finish_stream(stream_id, html)
+        self.end_hint_stream(stream_id)
+    
+    def on_stream_error(self, stream_id, error_msg):
+        """Show a stream error in place of the rest of the message"""
+        renderer, _ = self.streams.pop(stream_id, (None, None))
+        if renderer is None:
+            return
+        separator = "<br>" if renderer.started else ""
+        self.chat_display.finish_stream(stream_id, f"{renderer.finish()}{separator}<b>Error:</b> {error_msg}")
+        self.end_hint_stream(stream_id)
+    
+    def end_hint_stream(self, stream_id):
+        """Re-enable the hint button once Arlo's hint has finished"""
+        if stream_id == self.hint_stream_id:
+            self.hint_stream_id = None
+            self.reset_hint_button()
+    
+    def reset_hint_button(self):
+        self.hint_button.setText("Get Hint")
+        self.hint_button.setEnabled(True)
     
     def eventFilter(self, obj, event):
         """Handle Enter key in chat input"""
@@ -782,33 +1102,77 @@ class MainWindow(QMainWindow):
                 return True
         return super().eventFilter(obj, event)
     def easy_generate(self):
-        self._sudoku = Sudoku(3).difficulty(0.2)
-        self._solution = self._sudoku.solve()
-        self.selected_cell = None
-        if hasattr(self, '_original_board'):
-            delattr(self, '_original_board')
-        self.display_sudoku()
+        self.pool_generate("easy")
     def medium_generate(self):
-        self._sudoku = Sudoku(3).difficulty(0.4)
-        self._solution = self._sudoku.solve()
-        self.selected_cell = None
-        if hasattr(self, '_original_board'):
-            delattr(self, '_original_board')
-        self.display_sudoku()
+        self.pool_generate("medium")
     def difficult_generate(self):
-        self._sudoku = Sudoku(3).difficulty(0.8)
-        self._solution = self._sudoku.solve()
-        self.selected_cell = None
-        if hasattr(self, '_original_board'):
-            delattr(self, '_original_board')
+        self.pool_generate("difficult")
+    def pool_generate(self, level):
+        """Start a game from the corpus or puzzle pool, generating on demand if both are empty"""
+        if self.corpus_generate(level):
+            return
+        entry = self.puzzle_pool.pop(level)
+        if entry is None:
+            entry = generate_puzzle(level)
+        else:
+            self.puzzle_pool.save()
+        self.load_puzzle(*entry)
+        self.refill_puzzle_pool()
+    def corpus_generate(self, level):
+        """Start a game with a random corpus puzzle for a difficulty; return False if there is none"""
+        if self.corpus is None:
+            return False
+        _, grades = DIFFICULTY_LEVELS[level]
+        entry = self.corpus.random_puzzle((level,) + grades)
+        if entry is None:
+            return False
+        puzzle = from_string(entry[0])
+        solution = from_string(entry[1]) if entry[1] else self.solve_puzzle(puzzle)
+        self.load_puzzle(puzzle, solution)
+        return True
+    def large_generate(self, box_size, num=0.5):
+        """Start a 16x16 or 25x25 game"""
+        solution = dlx.generate_solution(box_size)
+        self.load_puzzle(dlx.blank_cells(solution, num), solution)
+    def load_puzzle(self, puzzle, solution):
+        """Start a new game from a puzzle board and its known solution"""
+        self.new_game(puzzle, solution)
         self.display_sudoku()
-    def custom_generate(self, num):
-        self._sudoku = Sudoku(3).difficulty(num)
-        self._solution = self._sudoku.solve()
+    
+    def new_game(self, puzzle, solution):
+        """Reset the game state for a puzzle board and its known solution"""
+        self.start_game(Board.from_rows(puzzle), solution)
+    
+    def start_game(self, board, solution):
+        """Reset the per-game state around a new or restored Board and its solution"""
+        self.box_size = board.box_size
+        self.board = board
+        self.solution = solution
+        self.board_index = BoardIndex(board.to_rows())
+        self.journal = Journal(board)
         self.selected_cell = None
-        if hasattr(self, '_original_board'):
-            delattr(self, '_original_board')
-        self.display_sudoku()
+        self.prepare_hints()
+        self.schedule_autosave()
+        if self.pending_ai:
+            # Requests queued during Arlo's warm-up were about the previous puzzle
+            self.pending_ai = []
+            self.reset_hint_button()
+    
+    def schedule_autosave(self):
+        """Save the game shortly after the last edit"""
+        self.autosave_timer.start()
+    
+    def autosave(self):
+        """Hand the current game to the background writer"""
+        self.autosave_writer.submit(encode_game(self.board, self.solution, self.game_mode))
+    
+    def solve_puzzle(self, puzzle):
+        """Solve a 9x9 puzzle with the bitmask solver"""
+        solution = solve(puzzle)
+        if solution is None:
+            # Fall back to py-sudoku's solver for boards we can't handle
+            return Sudoku(3, board=puzzle).solve().board
+        return solution
     
     def show_settings(self):
         """Show the settings dialog"""
@@ -829,15 +1193,21 @@ class MainWindow(QMainWindow):
     
     def update_ai_status(self):
         """Update AI status display"""
+        # Reset AI to None so it can be reinitialized with new key; a warm-up
+        # still running finishes in the background and its result is dropped
+        self.ai = None
+        self.ai_generation += 1
         if config.has_valid_api_key():
             self.ai_status.setText("Arlo not initialized")
             self.ai_status.setStyleSheet("color: gray; font-size: 10px;")
-            # Reset AI to None so it can be reinitialized with new key
-            self.ai = None
+            if self.pending_ai or config.get_ai_warmup():
+                self.start_ai_warmup()
         else:
             self.ai_status.setText("API key not configured")
             self.ai_status.setStyleSheet("color: red; font-size: 10px;")
-            self.ai = None
+            if self.pending_ai:
+                self.pending_ai = []
+                self.reset_hint_button()
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -0,0 +1,108 @@
+"""
+Game autosave
+
+The game in progress is saved as one small binary record (little-endian):
+
+    header    magic b"SSAV", version u8, mode u8, board length u16
+    board     Board.to_bytes(): cells plus given and hint masks
+    solution  one byte per cell
+
+A 9x9 game takes about 200 bytes. Records are written atomically (temp file
+plus os.replace) by AutosaveWriter on a background thread, which only keeps
+the latest pending record, so bursts of edits cost one write. This module
+avoids Qt and the AI stack so the save can be read before they are imported.
+"""
+
+import os
+import struct
+import threading
+
+from board import Board
+from fileutil import write_atomic
+
+MAGIC = b"SSAV"
+VERSION = 1
+HEADER = struct.Struct("<4sBBH")
+MODES = ("classic", "autocheck")
+
+
+def encode_game(board, solution, mode="classic"):
+    """Serialize a Board, its solution rows and the game mode"""
+    board_data = board.to_bytes()
+    header = HEADER.pack(MAGIC, VERSION, MODES.index(mode), len(board_data))
+    return header + board_data + bytes(value or 0 for row in solution for value in row)
+
+
+def decode_game(data):
+    """Return (board, solution rows, mode) from encode_game() output"""
+    if len(data) < HEADER.size:
+        raise ValueError("Truncated save data")
+    magic, version, mode, board_len = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION or mode >= len(MODES):
+        raise ValueError("Unsupported save data")
+    board = Board.from_bytes(data[HEADER.size:HEADER.size + board_len])
+    cells = data[HEADER.size + board_len:]
+    if len(cells) != board.size * board.size:
+        raise ValueError("Truncated save data")
+    solution = [list(cells[r * board.size:(r + 1) * board.size]) for r in range(board.size)]
+    return board, solution, MODES[mode]
+
+
+def load_game(path):
+    """Read a saved game, or None if there is none or it can't be used"""
+    try:
+        with open(path, 'rb') as f:
+            return decode_game(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Error loading saved game: {e}")
+        return None
+
+
+class AutosaveWriter:
+    """Background thread that writes the most recently submitted record"""
+
+    def __init__(self, path):
+        self.path = path
+        self._cond = threading.Condition()
+        self._pending = None  # Latest record, b"" to delete the save
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def submit(self, data):
+        """Queue a record, replacing any that has not been written yet"""
+        with self._cond:
+            self._pending = data
+            self._cond.notify()
+
+    def clear(self):
+        """Queue removal of the save, e.g. once the game is finished"""
+        self.submit(b"")
+
+    def _write(self, data):
+        try:
+            if data:
+                write_atomic(self.path, data)
+            elif os.path.exists(self.path):
+                os.remove(self.path)
+        except OSError as e:
+            print(f"Error saving game: {e}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                data, self._pending = self._pending, None
+                if data is None:
+                    return  # Closed with nothing left to write
+            self._write(data)
+
+    def close(self):
+        """Write anything still pending and stop the thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
@@ -0,0 +1,143 @@
+"""
+NumPy-vectorized batch solver for 9x9 Sudoku
+
+Solves many boards at once by running candidate elimination and naked/hidden
+single propagation as array operations over an (N, 81) uint8 array, with 0
+marking empty cells. Boards that stall once propagation stops making progress
+fall back to the per-board bitmask search in solver.py.
+"""
+
+import numpy as np
+
+from solver import UNITS, solve_grid
+
+# Per-board status codes returned by solve_batch
+SOLVED = 0            # Solved by vectorized propagation alone
+SOLVED_BY_SEARCH = 1  # Propagation stalled, solved by per-board search
+UNSOLVABLE = 2        # Conflicting givens or no solution
+
+ALL_DIGITS = 0x1FF
+DEFAULT_CHUNK_SIZE = 10000
+
+UNIT_CELLS = np.array(UNITS, dtype=np.intp)                     # (27, 9)
+CELL_UNITS = np.array(
+    [[u for u, unit in enumerate(UNITS) if i in unit] for i in range(81)],
+    dtype=np.intp,
+)                                                               # (81, 3)
+DIGIT_BITS = (1 << np.arange(9, dtype=np.uint16)).astype(np.uint16)
+BIT_OF_VALUE = np.concatenate(([0], DIGIT_BITS)).astype(np.uint16)  # 0 -> no bit
+
+# Lookup tables indexed by a 9-bit candidate mask
+POPCOUNT = np.array([bin(m).count("1") for m in range(512)], dtype=np.uint8)
+SINGLE_DIGIT = np.zeros(512, dtype=np.uint8)
+for _d in range(9):
+    SINGLE_DIGIT[1 << _d] = _d + 1
+
+
+def from_strings(lines):
+    """Parse 81-character puzzle strings ('.' or '0' for empty) into an (N, 81) array"""
+    stripped = [line.strip() for line in lines]
+    for number, line in enumerate(stripped, 1):
+        if len(line) != 81:
+            raise ValueError(f"Line {number}: expected 81 characters, got {len(line)}")
+    raw = np.frombuffer("".join(stripped).encode("ascii"), dtype=np.uint8)
+    grid = raw.reshape(-1, 81).astype(np.int16) - ord("0")
+    grid[(grid < 0) | (grid > 9)] = 0
+    return grid.astype(np.uint8)
+
+
+def to_strings(grids):
+    """Format an (N, 81) array as 81-character digit strings"""
+    text = (np.asarray(grids, dtype=np.uint8) + ord("0")).tobytes().decode("ascii")
+    return [text[i:i + 81] for i in range(0, len(text), 81)]
+
+
+def _candidates(grid):
+    """Return (candidate masks, invalid flags) for a batch of grids"""
+    filled = grid > 0
+    bits = BIT_OF_VALUE[grid]
+
+    unit_bits = bits[:, UNIT_CELLS]                                   # (N, 27, 9)
+    unit_used = np.bitwise_or.reduce(unit_bits, axis=2)               # (N, 27)
+    # A duplicate digit in a unit means fewer distinct bits than filled cells
+    duplicates = POPCOUNT[unit_used] != filled[:, UNIT_CELLS].sum(axis=2)
+
+    used = np.bitwise_or.reduce(unit_used[:, CELL_UNITS], axis=2)      # (N, 81)
+    cands = np.where(filled, 0, ALL_DIGITS & ~used).astype(np.uint16)
+
+    # Every digit must still be placed or placeable in every unit
+    unit_cands = np.bitwise_or.reduce(cands[:, UNIT_CELLS], axis=2)
+    uncovered = (unit_used | unit_cands) != ALL_DIGITS
+    dead_cell = ~filled & (cands == 0)
+
+    invalid = duplicates.any(axis=1) | uncovered.any(axis=1) | dead_cell.any(axis=1)
+    return cands, invalid
+
+
+def _propagate(grid):
+    """Run singles propagation in place; return (solved, invalid) flags per board"""
+    active = np.arange(len(grid))
+    solved = np.zeros(len(grid), dtype=bool)
+    invalid = np.zeros(len(grid), dtype=bool)
+
+    while len(active):
+        sub = grid[active]
+        cands, bad = _candidates(sub)
+        invalid[active[bad]] = True
+        done = ~bad & (sub > 0).all(axis=1)
+        solved[active[done]] = True
+
+        keep = ~bad & ~done
+        sub, cands = sub[keep], cands[keep]
+        before = sub.copy()
+
+        # Naked singles
+        single = SINGLE_DIGIT[cands]
+        np.copyto(sub, single, where=single > 0)
+
+        # Hidden singles, one digit at a time to bound memory
+        for d in range(9):
+            has = (cands & DIGIT_BITS[d]) != 0
+            unit_has = has[:, UNIT_CELLS]                             # (N, 27, 9)
+            once = unit_has.sum(axis=2) == 1                          # (N, 27)
+            boards, units = np.nonzero(once)
+            if len(boards):
+                cells = UNIT_CELLS[units, unit_has[boards, units].argmax(axis=1)]
+                sub[boards, cells] = d + 1
+
+        progressed = (sub != before).any(axis=1)
+        grid[active[keep]] = sub
+        # Boards that made no progress have stalled and leave the vectorized loop
+        active = active[keep][progressed]
+
+    return solved, invalid
+
+
+def solve_batch(puzzles, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Solve an (N, 81) uint8 array of puzzles
+
+    Returns (solutions, status) where solutions is an (N, 81) uint8 array and
+    status holds SOLVED, SOLVED_BY_SEARCH or UNSOLVABLE per board. Unsolvable
+    boards are returned unchanged.
+    """
+    puzzles = np.ascontiguousarray(puzzles, dtype=np.uint8).reshape(-1, 81)
+    solutions = puzzles.copy()
+    status = np.full(len(puzzles), UNSOLVABLE, dtype=np.uint8)
+
+    for start in range(0, len(puzzles), chunk_size):
+        grid = solutions[start:start + chunk_size]
+        solved, invalid = _propagate(grid)
+        status[start:start + chunk_size][solved] = SOLVED
+
+        # Per-board search for boards that stalled on propagation
+        for i in np.nonzero(~solved & ~invalid)[0]:
+            result = solve_grid(grid[i].tolist())
+            if result is not None:
+                grid[i] = result
+                status[start + i] = SOLVED_BY_SEARCH
+            else:
+                grid[i] = puzzles[start + i]
+
+        grid[invalid] = puzzles[start:start + chunk_size][invalid]
+
+    return solutions, status
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Performance benchmarks for the solver, generator, validation and UI paths
+
+Runs every benchmark on fixed, graded puzzle fixtures and writes the results
+as JSON. With --compare, the run is checked against a stored baseline and
+any benchmark that got slower by more than the threshold is reported as a
+regression (exit status 1).
+
+    python benchmark.py -o baseline.json
+    python benchmark.py --compare baseline.json --threshold 0.2
+
+UI benchmarks run MainWindow on Qt's offscreen platform with a throwaway
+config directory; skip them with --no-ui.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Fixed puzzles per logical grade (generated once with seed 2026)
+FIXTURES = {
+    "easy": [
+        "807109240401302008520008007010083006030000080200960030100800079300704601079501804",
+        "607839105003010009904060823062003008000080000700600230276090401800070300301428907",
+        "067004209000250061025106084001500070650000028070008500790803410580071000406900830",
+        "300700009092040573714350860100020080600000007080010004031078695927060430500003001",
+    ],
+    "medium": [
+        "506000000170003400090020007000500080000407200030006000800040030004600098000000004",
+        "000009460800020000975000080000001070600050009040902000020000814000080000003600000",
+        "005000630690500000010063000208000070000030000060000208000790000000002015041000700",
+        "204000600100007000000020140006700000430000097000009300001030000500600004082000905",
+    ],
+    "difficult": [
+        "206000030000023100005600800190000000000706000000050071008004900000390000050000204",
+        "140905006090700050200000000000007240500000009030810000000000002800000010900603085",
+        "750002000080000130000600000100340000060000900000028006000003020071000080000410050",
+        "000050080809000702000001506000600037000000040130004000501800000006000201090030000",
+    ],
+    "expert": [
+        "006002800070300000000480006607000028000000000830000704900056000001203050000100900",
+        "000008060000005400480020007004003750000000000037000100300150020001600000060300090",
+        "030800000040067050007000640000002400006090520004300000008000000020980070000000010",
+        "000100003000002080003480109060000005001070400400000030502018700090200000600004000",
+    ],
+}
+DEFAULT_THRESHOLD = 0.2  # Fractional slowdown reported as a regression
+
+
+def measure(fn, ops=1, repeat=5, min_time=0.05):
+    """Time fn() and return the median seconds per operation
+
+    Each repeat calls fn() until at least min_time has passed; ops is the
+    number of operations a single call performs.
+    """
+    samples = []
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            fn()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        samples.append(elapsed / (calls * ops))
+    return statistics.median(samples)
+
+
+def result(seconds_per_op, ops):
+    """Build a result entry"""
+    return {
+        "seconds_per_op": seconds_per_op,
+        "ops_per_sec": 1 / seconds_per_op if seconds_per_op else None,
+        "ops": ops,
+    }
+
+
+def bench_solver(results, quick):
+    """Bitmask solver, logical grader and (if numpy is installed) batch solver throughput"""
+    from logical_solver import grade
+    from solver import solve_grid
+
+    repeat = 3 if quick else 5
+    for level, puzzles in FIXTURES.items():
+        grids = [[int(ch) for ch in puzzle] for puzzle in puzzles]
+        results[f"solve.{level}"] = result(
+            measure(lambda: [solve_grid(grid) for grid in grids], len(grids), repeat), len(grids))
+        results[f"grade.{level}"] = result(
+            measure(lambda: [grade(grid) for grid in grids], len(grids), repeat), len(grids))
+
+    try:
+        import batch_solver
+    except ImportError:
+        return
+    puzzles = [puzzle for level in FIXTURES.values() for puzzle in level] * 250
+    batch = batch_solver.from_strings(puzzles)
+    results["solve.batch"] = result(
+        measure(lambda: batch_solver.solve_batch(batch), len(puzzles), repeat, min_time=0), len(puzzles))
+
+
+def bench_generator(results, quick):
+    """Unique-solution puzzle generation, with and without grading by level"""
+    import generator
+    from puzzle_pool import generate_puzzle
+
+    count = 2 if quick else 10
+    rng = random.Random(2026)
+    results["generate.clues40"] = result(
+        measure(lambda: [generator.generate(target_clues=40, rng=rng) for _ in range(count)],
+                count, 3, min_time=0), count)
+    results["generate.minimal"] = result(
+        measure(lambda: [generator.generate(minimal=True, rng=rng) for _ in range(count)],
+                count, 3, min_time=0), count)
+    for level in ("easy", "medium"):
+        results[f"generate.{level}"] = result(
+            measure(lambda: [generate_puzzle(level, rng) for _ in range(count)], count, 3, min_time=0), count)
+
+
+def bench_validation(results, quick):
+    """Incremental move validation and completion checks on BoardIndex"""
+    from board_index import BoardIndex
+    from solver import from_string, solve
+
+    repeat = 3 if quick else 5
+    puzzle = from_string(FIXTURES["medium"][0])
+    solution = solve(puzzle)
+    index = BoardIndex(puzzle)
+    empty = [(r, c) for r in range(9) for c in range(9) if puzzle[r][c] is None]
+
+    def valid_moves():
+        for r, c in empty:
+            for value in range(1, 10):
+                index.is_valid_move(r, c, value)
+
+    def fill_and_clear():
+        for r, c in empty:
+            index.set(r, c, solution[r][c])
+        index.is_solved()
+        for r, c in empty:
+            index.set(r, c, 0)
+
+    results["validate.is_valid_move"] = result(measure(valid_moves, 9 * len(empty), repeat), 9 * len(empty))
+    results["validate.set"] = result(measure(fill_and_clear, 2 * len(empty), repeat), 2 * len(empty))
+
+
+def bench_ui(results, quick):
+    """MainWindow keystroke latency and full board refreshes under the offscreen platform"""
+    # Must be set before Qt is imported
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    from config import config
+
+    # Point the config at a scratch directory so the user's saves are never touched
+    saved_paths = (config.config_dir, config.config_file, config.env_file)
+    bench_dir = Path(tempfile.mkdtemp(prefix="sudoku-bench-"))
+    config.config_dir, config.config_file, config.env_file = (
+        bench_dir, bench_dir / "config.json", bench_dir / ".env")
+    config.set_ai_warmup(False)  # Keep Arlo's startup out of the measurements
+    try:
+        bench_window(app, results, quick)
+    finally:
+        config.config_dir, config.config_file, config.env_file = saved_paths
+        shutil.rmtree(bench_dir, ignore_errors=True)
+
+
+def bench_window(app, results, quick):
+    """The UI measurements proper; bench_ui sets up the environment"""
+    from app import MainWindow
+    from solver import from_string, solve
+
+    window = MainWindow()
+    window.pool_worker.stop()
+    window.pool_worker.wait()
+
+    repeat = 3 if quick else 5
+    puzzle = from_string(FIXTURES["medium"][0])
+    window.load_puzzle(puzzle, solve(puzzle))
+    window.show()
+    app.processEvents()
+    empty = [(r, c) for r in range(9) for c in range(9) if puzzle[r][c] is None]
+
+    def keystrokes():
+        # Enter then erase a digit in every empty cell, never completing the board
+        for r, c in empty:
+            window.set_cell_value(r, c, window.solution[r][c])
+            window.set_cell_value(r, c, 0)
+
+    for mode in ("classic", "autocheck"):
+        window.set_mode(mode)
+        results[f"ui.set_cell_value.{mode}"] = result(measure(keystrokes, 2 * len(empty), repeat), 2 * len(empty))
+        results[f"ui.update_all_cells.{mode}"] = result(measure(window.update_all_cells, 1, repeat), 1)
+    results["ui.check_completion"] = result(measure(window.check_completion, 1, repeat), 1)
+
+    def rebuild():
+        window.display_sudoku()
+        app.processEvents()
+
+    results["ui.display_sudoku.9x9"] = result(measure(rebuild, 1, repeat), 1)
+    window.large_generate(4)
+    results["ui.display_sudoku.16x16"] = result(measure(rebuild, 1, repeat), 1)
+
+    window.close()
+    app.processEvents()
+
+
+BENCHMARKS = {
+    "solver": bench_solver,
+    "generator": bench_generator,
+    "validation": bench_validation,
+    "ui": bench_ui,
+}
+
+
+def run(groups, quick=False):
+    """Run benchmark groups and return the JSON-ready report"""
+    results = {}
+    for group in groups:
+        print(f"Running {group} benchmarks...", file=sys.stderr)
+        BENCHMARKS[group](results, quick)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": quick,
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return (name, baseline, current, change) for benchmarks that slowed down by more than threshold"""
+    regressions = []
+    for name, current in report["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous["seconds_per_op"]:
+            continue
+        change = current["seconds_per_op"] / previous["seconds_per_op"] - 1
+        if change > threshold:
+            regressions.append((name, previous["seconds_per_op"], current["seconds_per_op"], change))
+    return regressions
+
+
+def format_time(seconds):
+    """Format a duration with a readable unit"""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv=None):
+    """Run the benchmarks, save the results and optionally compare with a baseline"""
+    parser = argparse.ArgumentParser(description="Benchmark Super Sudoku's hot paths.")
+    parser.add_argument('-o', '--output', help="write the results as JSON to this file")
+    parser.add_argument('--compare', metavar='BASELINE', help="flag regressions against a saved results file")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown fraction reported as a regression (default: %(default)s)")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help="run only these groups")
+    parser.add_argument('--no-ui', action='store_true', help="skip the Qt benchmarks")
+    parser.add_argument('--quick', action='store_true', help="fewer repeats, for smoke runs")
+    args = parser.parse_args(argv)
+
+    groups = args.only or [group for group in BENCHMARKS if not (args.no_ui and group == "ui")]
+    report = run(groups, args.quick)
+
+    for name, entry in report["results"].items():
+        print(f"{name:32} {format_time(entry['seconds_per_op']):>12} per op", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for name, before, after, change in regressions:
+            print(f"REGRESSION {name}: {format_time(before)} -> {format_time(after)} (+{change:.0%})",
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions above {args.threshold:.0%}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Compact Sudoku board representation
+
+A Board stores one byte per cell in a bytearray (0 for empty) and keeps the
+given and hint cells as integer bitsets. snapshot() returns an immutable
+bytes copy that background threads can read safely while the UI keeps
+editing the board, and that doubles as a hash key.
+"""
+
+import math
+
+FORMAT_VERSION = 1
+
+
+def snapshot_rows(snapshot):
+    """Convert a snapshot to a list of lists with None for empty cells"""
+    size = math.isqrt(len(snapshot))
+    return [[value or None for value in snapshot[r * size:(r + 1) * size]] for r in range(size)]
+
+
+class Board:
+    """Mutable game board: cell values plus given and hint masks"""
+
+    __slots__ = ('size', 'box_size', 'cells', 'given_mask', 'hint_mask')
+
+    def __init__(self, size=9):
+        self.size = size
+        self.box_size = math.isqrt(size)
+        self.cells = bytearray(size * size)
+        self.given_mask = 0  # Bit i set when cell i is part of the puzzle
+        self.hint_mask = 0  # Bit i set when cell i was filled by a hint
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a board from a list of lists; every filled cell becomes a given"""
+        board = cls(len(rows))
+        i = 0
+        for row in rows:
+            for value in row:
+                if value:
+                    board.cells[i] = value
+                    board.given_mask |= 1 << i
+                i += 1
+        return board
+
+    def get(self, row, col):
+        """Return the value of a cell, 0 if empty"""
+        return self.cells[row * self.size + col]
+
+    def set(self, row, col, value):
+        """Set the value of a cell (0 or None to clear)"""
+        self.cells[row * self.size + col] = value or 0
+
+    def is_given(self, row, col):
+        """Check if a cell is part of the original puzzle"""
+        return bool(self.given_mask >> (row * self.size + col) & 1)
+
+    def is_hint(self, row, col):
+        """Check if a cell was filled by a hint"""
+        return bool(self.hint_mask >> (row * self.size + col) & 1)
+
+    def set_hint(self, row, col):
+        """Mark a cell as filled by a hint"""
+        self.hint_mask |= 1 << (row * self.size + col)
+
+    def is_editable(self, row, col):
+        """Check if the player may change a cell"""
+        bit = 1 << (row * self.size + col)
+        return not (self.given_mask | self.hint_mask) & bit
+
+    def filled_count(self):
+        """Number of non-empty cells"""
+        return len(self.cells) - self.cells.count(0)
+
+    def snapshot(self):
+        """Return an immutable copy of the cell values"""
+        return bytes(self.cells)
+
+    def to_rows(self):
+        """Return the current values as a list of lists with None for empty cells"""
+        return snapshot_rows(self.cells)
+
+    def given_rows(self):
+        """Return the original puzzle as a list of lists with None for empty cells"""
+        return [[self.cells[r * self.size + c] if self.is_given(r, c) else None
+                 for c in range(self.size)] for r in range(self.size)]
+
+    def to_bytes(self):
+        """Serialize as version, size, cells, given mask and hint mask"""
+        mask_len = (len(self.cells) + 7) // 8
+        return (bytes((FORMAT_VERSION, self.size)) + self.cells
+                + self.given_mask.to_bytes(mask_len, 'little')
+                + self.hint_mask.to_bytes(mask_len, 'little'))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Rebuild a board from to_bytes() output"""
+        if len(data) < 2 or data[0] != FORMAT_VERSION:
+            raise ValueError("Unsupported board data")
+        board = cls(data[1])
+        count = len(board.cells)
+        mask_len = (count + 7) // 8
+        if len(data) != 2 + count + 2 * mask_len:
+            raise ValueError("Truncated board data")
+        board.cells[:] = data[2:2 + count]
+        offset = 2 + count
+        board.given_mask = int.from_bytes(data[offset:offset + mask_len], 'little')
+        board.hint_mask = int.from_bytes(data[offset + mask_len:], 'little')
+        return board
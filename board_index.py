@@ -0,0 +1,72 @@
+"""
+Incremental constraint index for a Sudoku board
+
+Keeps per-row, per-column and per-box digit counts together with a running
+filled-cell count and conflict count, so autocheck, completion and correctness
+checks are O(1) per edit instead of rescanning the board.
+"""
+
+
+class BoardIndex:
+    """Digit counts per unit plus filled and conflict totals for one board"""
+
+    def __init__(self, board):
+        self.size = len(board)
+        self.box_size = int(round(self.size ** 0.5))
+        self.values = [[0] * self.size for _ in range(self.size)]
+        # counts[unit][digit] for rows, columns and boxes
+        self.row_counts = [[0] * (self.size + 1) for _ in range(self.size)]
+        self.col_counts = [[0] * (self.size + 1) for _ in range(self.size)]
+        self.box_counts = [[0] * (self.size + 1) for _ in range(self.size)]
+        self.filled = 0
+        self.conflicts = 0  # Number of duplicate digit pairs across all units
+
+        for row in range(self.size):
+            for col in range(self.size):
+                value = board[row][col]
+                if value:
+                    self.set(row, col, value)
+
+    def box_of(self, row, col):
+        """Return the box number containing a cell"""
+        return (row // self.box_size) * self.box_size + col // self.box_size
+
+    def set(self, row, col, value):
+        """Record a new value (0 or None to clear) for a cell"""
+        value = value or 0
+        old = self.values[row][col]
+        if old == value:
+            return
+
+        units = (self.row_counts[row], self.col_counts[col], self.box_counts[self.box_of(row, col)])
+        if old:
+            self.filled -= 1
+            for counts in units:
+                counts[old] -= 1
+                self.conflicts -= counts[old]
+        if value:
+            self.filled += 1
+            for counts in units:
+                self.conflicts += counts[value]
+                counts[value] += 1
+        self.values[row][col] = value
+
+    def is_valid_move(self, row, col, value):
+        """Check whether value at (row, col) clashes with any other cell"""
+        own = 1 if self.values[row][col] == value else 0
+        return (self.row_counts[row][value] == own
+                and self.col_counts[col][value] == own
+                and self.box_counts[self.box_of(row, col)][value] == own)
+
+    def has_conflict(self, row, col):
+        """Check whether the cell's current value clashes with a peer"""
+        value = self.values[row][col]
+        return bool(value) and not self.is_valid_move(row, col, value)
+
+    def is_complete(self):
+        """Check if every cell is filled"""
+        return self.filled == self.size * self.size
+
+    def is_solved(self):
+        """Check if every cell is filled and no unit has a duplicate"""
+        return self.is_complete() and self.conflicts == 0
@@ -0,0 +1,71 @@
+"""
+Chat transcript storage
+
+Messages get sequential integer ids. Only the newest max_live messages are
+kept in memory; older ones are spilled to a JSON-lines file and read back
+on demand through a per-message offset table (8 bytes per message), so a
+long session costs neither memory nor layout time. The file holds the
+current session only and is truncated when a log is created.
+"""
+
+import json
+import os
+from array import array
+from collections import OrderedDict
+
+MAX_LIVE = 200
+
+
+class ChatLog:
+    """Append-only message store with a bounded in-memory window"""
+
+    def __init__(self, path, max_live=MAX_LIVE):
+        self.path = path
+        self.max_live = max_live
+        self.live = OrderedDict()  # id -> html, newest last
+        self.offsets = array('q')  # File offset per id - 1, -1 while the message is live
+        self._file = open(path, 'w+', encoding='utf-8')
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def append(self, html):
+        """Add a message and return its id"""
+        self.offsets.append(-1)
+        message_id = len(self.offsets)
+        self.live[message_id] = html
+        while len(self.live) > self.max_live:
+            self._spill(*self.live.popitem(last=False))
+        return message_id
+
+    def _spill(self, message_id, html):
+        self._file.seek(0, os.SEEK_END)
+        self.offsets[message_id - 1] = self._file.tell()
+        self._file.write(json.dumps({'id': message_id, 'html': html}) + '\n')
+
+    def update(self, message_id, html):
+        """Replace the content of a message"""
+        if message_id in self.live:
+            self.live[message_id] = html
+        elif 0 < message_id <= len(self.offsets):
+            self._spill(message_id, html)  # The newest record for an id wins
+        else:
+            raise KeyError(message_id)
+
+    def get(self, message_id):
+        """Return the HTML of a message, reading it from disk if it was spilled"""
+        if message_id in self.live:
+            return self.live[message_id]
+        if not 0 < message_id <= len(self.offsets):
+            raise KeyError(message_id)
+        self._file.flush()
+        self._file.seek(self.offsets[message_id - 1])
+        return json.loads(self._file.readline())['html']
+
+    def before(self, message_id, count):
+        """Return up to count (id, html) pairs for the messages just before message_id, oldest first"""
+        first = max(1, message_id - count)
+        return [(i, self.get(i)) for i in range(first, message_id)]
+
+    def close(self):
+        self._file.close()
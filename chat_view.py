@@ -0,0 +1,135 @@
+from PyQt6.QtWidgets import QTextEdit
+from PyQt6.QtGui import QTextBlockFormat, QTextCharFormat, QTextCursor
+
+from chat_log import ChatLog
+
+class ChatTranscript(QTextEdit):
+    """Read-only chat display backed by a ChatLog
+
+    Each message is one text block tagged with its id (QTextBlock user
+    state), so messages are updated by id rather than by cursor position.
+    The document holds at most max_blocks messages while the view follows
+    the conversation; scrolling to the top loads earlier messages from the
+    log in batches.
+    """
+
+    LOAD_BATCH = 20
+
+    def __init__(self, log_path, max_blocks=100, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.log = ChatLog(log_path, max_live=max(max_blocks, 2 * self.LOAD_BATCH))
+        self.max_blocks = max_blocks
+        self.streams = {}  # Message id -> (HTML committed so far, its length in characters)
+        self.verticalScrollBar().valueChanged.connect(self.on_scroll)
+
+    def first_id(self):
+        """Id of the oldest message in the document, or None if there is none"""
+        block = self.document().firstBlock()
+        return block.userState() if block.userState() > 0 else None
+
+    def find_block(self, message_id):
+        """Return the block showing a message, or None if it isn't in the document"""
+        block = self.document().lastBlock()
+        while block.isValid():
+            state = block.userState()
+            if state == message_id:
+                return block
+            if 0 < state < message_id:
+                return None  # Ids increase down the document
+            block = block.previous()
+        return None
+
+    def at_bottom(self):
+        scrollbar = self.verticalScrollBar()
+        return scrollbar.value() >= scrollbar.maximum() - 4
+
+    def add_message(self, html):
+        """Append a message and return its id"""
+        message_id = self.log.append(html)
+        follow = self.at_bottom()
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if self.first_id() is not None:
+            cursor.insertBlock(QTextBlockFormat(), QTextCharFormat())
+        cursor.insertHtml(html)
+        cursor.block().setUserState(message_id)
+        if follow:
+            self.trim()
+            self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        return message_id
+
+    def set_message(self, message_id, html):
+        """Replace the content of a message"""
+        self.log.update(message_id, html)
+        block = self.find_block(message_id)
+        if block is not None:
+            cursor = QTextCursor(block)
+            cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+            cursor.insertHtml(html)
+
+    def trim(self):
+        """Drop the oldest messages from the document beyond max_blocks; the log keeps them"""
+        document = self.document()
+        extra = document.blockCount() - self.max_blocks
+        if extra <= 0:
+            return
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.MoveOperation.NextBlock, QTextCursor.MoveMode.KeepAnchor, extra)
+        cursor.removeSelectedText()
+
+    def on_scroll(self, value):
+        """Load earlier messages when the user scrolls to the top"""
+        first = self.first_id()
+        if value != 0 or first is None or first <= 1:
+            return
+        scrollbar = self.verticalScrollBar()
+        height = scrollbar.maximum()
+        earlier = self.log.before(first, self.LOAD_BATCH)
+        cursor = QTextCursor(self.document())
+        for _, html in earlier:
+            cursor.insertHtml(html)
+            cursor.insertBlock(QTextBlockFormat(), QTextCharFormat())
+        # Splitting blocks doesn't say which half keeps its id, so retag them all
+        block = self.document().firstBlock()
+        for message_id, _ in earlier:
+            block.setUserState(message_id)
+            block = block.next()
+        block.setUserState(first)
+        scrollbar.setValue(scrollbar.maximum() - height)
+
+    # Streamed messages: a committed prefix plus a tail that is replaced per chunk
+
+    def start_stream(self, prefix_html, placeholder_html):
+        """Add a message showing prefix and a placeholder tail; return its id"""
+        message_id = self.add_message(prefix_html)
+        block = self.find_block(message_id)
+        self.streams[message_id] = (prefix_html, block.length() - 1)
+        self.update_stream(message_id, "", placeholder_html)
+        return message_id
+
+    def update_stream(self, message_id, done_html, tail_html):
+        """Append finished HTML to a streamed message and replace its tail"""
+        committed, committed_chars = self.streams[message_id]
+        committed += done_html
+        block = self.find_block(message_id)
+        if block is not None:
+            follow = self.at_bottom()
+            cursor = QTextCursor(block)
+            cursor.setPosition(block.position() + committed_chars)
+            cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+            cursor.removeSelectedText()
+            if done_html:
+                cursor.insertHtml(done_html)
+            committed_chars = cursor.position() - block.position()
+            if tail_html:
+                cursor.insertHtml(tail_html)
+            if follow:
+                self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        self.streams[message_id] = (committed, committed_chars)
+        self.log.update(message_id, committed + tail_html)
+
+    def finish_stream(self, message_id, done_html):
+        """Commit the last of a streamed message"""
+        self.update_stream(message_id, done_html, "")
+        del self.streams[message_id]
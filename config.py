@@ -79,6 +79,16 @@ class Config:
         except IOError as e:
             print(f"Error saving config: {e}")
     
+    def get_ai_warmup(self):
+        """Whether Arlo should start loading as soon as the app opens"""
+        return self.load_config().get('ai_warmup', True)
+    
+    def set_ai_warmup(self, enabled):
+        """Save whether Arlo should start loading as soon as the app opens"""
+        config_data = self.load_config()
+        config_data['ai_warmup'] = enabled
+        self.save_config(config_data)
+    
     def get_pdf_path(self):
         """Get the path to the solving_sudoku.pdf file"""
         # Check if running as PyInstaller bundle
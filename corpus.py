@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped packed puzzle corpus
+
+Corpus file layout (little-endian):
+
+    header   magic b"SSPC", version u8, flags u8, reserved u16, count u32
+    records  count x (41-byte puzzle [+ 41-byte solution if FLAG_SOLUTIONS])
+
+Each 81-cell board is packed two cells per byte (high nibble first, '0' for
+empty), which is exactly the hex encoding of its digit string, padded to an
+even length. A sidecar index (<corpus>.idx) lists record numbers grouped by
+difficulty level and clue count:
+
+    header   magic b"SSPI", version u8, reserved u8 x3, bucket count u32
+    buckets  bucket count x (level u8, clues u8, reserved u16, start u32, size u32)
+    ids      u32 record numbers, bucket after bucket
+
+Both files are opened with mmap, so reading puzzle i is a single slice and
+drawing a random puzzle from a bucket never reads the rest of the file.
+
+Build a corpus from 'puzzle [solution] [level]' lines (the output of
+generate_puzzles.py):
+
+    python corpus.py puzzles.txt puzzles.corpus
+"""
+
+import argparse
+import mmap
+import random
+import struct
+import sys
+from array import array
+
+MAGIC = b"SSPC"
+INDEX_MAGIC = b"SSPI"
+VERSION = 1
+FLAG_SOLUTIONS = 1
+HEADER = struct.Struct("<4sBBHI")
+INDEX_HEADER = struct.Struct("<4sB3xI")
+BUCKET = struct.Struct("<BBHII")
+PACKED_SIZE = 41
+
+# Level names stored in the index; code 0 means ungraded
+LEVELS = ("unknown", "easy", "medium", "difficult", "expert")
+LEVEL_CODES = {name: code for code, name in enumerate(LEVELS)}
+
+
+def pack(board_string):
+    """Pack an 81-character digit string ('0' or '.' for empty) into 41 bytes"""
+    return bytes.fromhex(board_string.replace(".", "0") + "0")
+
+
+def unpack(data):
+    """Unpack 41 bytes into an 81-character digit string"""
+    return data.hex()[:81]
+
+
+def index_path(path):
+    """Return the sidecar index path for a corpus file"""
+    return f"{path}.idx"
+
+
+class CorpusWriter:
+    """Streams records to a new corpus file and writes its index on close"""
+
+    def __init__(self, path, with_solutions=True):
+        self.path = path
+        self.with_solutions = with_solutions
+        self.count = 0
+        self._buckets = {}  # (level code, clues) -> array of record ids
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0))
+
+    def add(self, puzzle, solution=None, level=None):
+        """Append a puzzle string, with its solution if the corpus stores them"""
+        if len(puzzle) != 81:
+            raise ValueError("Puzzle must have 81 cells")
+        record = pack(puzzle)
+        if self.with_solutions:
+            if not solution or len(solution) != 81:
+                raise ValueError("This corpus requires a solution for every puzzle")
+            record += pack(solution)
+        self._file.write(record)
+
+        clues = 81 - puzzle.count("0") - puzzle.count(".")
+        key = (LEVEL_CODES.get(level or "unknown", 0), clues)
+        self._buckets.setdefault(key, array('I')).append(self.count)
+        self.count += 1
+
+    def close(self):
+        """Finish the corpus header and write the sidecar index"""
+        flags = FLAG_SOLUTIONS if self.with_solutions else 0
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, flags, 0, self.count))
+        self._file.close()
+
+        with open(index_path(self.path), 'wb') as f:
+            keys = sorted(self._buckets)
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, VERSION, len(keys)))
+            start = 0
+            for level, clues in keys:
+                size = len(self._buckets[(level, clues)])
+                f.write(BUCKET.pack(level, clues, 0, start, size))
+                start += size
+            for key in keys:
+                ids = self._buckets[key]
+                if sys.byteorder == 'big':
+                    ids.byteswap()
+                ids.tofile(f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Corpus:
+    """Read-only, memory-mapped view of a corpus and its index"""
+
+    def __init__(self, path):
+        self._file = self._data = self._index_file = self._index = None
+        try:
+            self._open(path)
+        except (struct.error, IndexError) as e:
+            self.close()
+            raise ValueError(f"Corrupt puzzle corpus {path}: {e}") from e
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(self, path):
+        self._file = open(path, 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, flags, _, self.count = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a puzzle corpus: {path}")
+        self.has_solutions = bool(flags & FLAG_SOLUTIONS)
+        self.record_size = PACKED_SIZE * (2 if self.has_solutions else 1)
+        if len(self._data) < HEADER.size + self.count * self.record_size:
+            raise ValueError(f"Truncated puzzle corpus: {path}")
+
+        self._index_file = open(index_path(path), 'rb')
+        self._index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, bucket_count = INDEX_HEADER.unpack_from(self._index, 0)
+        if magic != INDEX_MAGIC or version != VERSION:
+            raise ValueError(f"Not a puzzle corpus index: {index_path(path)}")
+        self.buckets = {}  # (level name, clues) -> (start, size) into the id table
+        offset = INDEX_HEADER.size
+        for _ in range(bucket_count):
+            level, clues, _, start, size = BUCKET.unpack_from(self._index, offset)
+            self.buckets[(LEVELS[level], clues)] = (start, size)
+            offset += BUCKET.size
+        self._ids_offset = offset
+
+    def __len__(self):
+        return self.count
+
+    def _record_offset(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError("Puzzle index out of range")
+        return HEADER.size + i * self.record_size
+
+    def puzzle(self, i):
+        """Return puzzle i as an 81-character digit string"""
+        offset = self._record_offset(i)
+        return unpack(self._data[offset:offset + PACKED_SIZE])
+
+    def solution(self, i):
+        """Return the solution of puzzle i, or None if the corpus has none"""
+        if not self.has_solutions:
+            return None
+        offset = self._record_offset(i) + PACKED_SIZE
+        return unpack(self._data[offset:offset + PACKED_SIZE])
+
+    def bucket_size(self, level, clues=None):
+        """Number of puzzles for a level, optionally with an exact clue count"""
+        return sum(size for (lvl, c), (_, size) in self.buckets.items()
+                   if lvl == level and (clues is None or c == clues))
+
+    def random_id(self, levels, clues=None, rng=None):
+        """Pick a random record number from the buckets for one or more levels, or None
+
+        Only the bucket table (at most a few hundred entries) is scanned; the
+        chosen id is read with a single 4-byte slice.
+        """
+        rng = rng or random
+        if isinstance(levels, str):
+            levels = (levels,)
+        chosen = [(start, size) for (lvl, c), (start, size) in self.buckets.items()
+                  if lvl in levels and (clues is None or c == clues) and size]
+        total = sum(size for _, size in chosen)
+        if not total:
+            return None
+        k = rng.randrange(total)
+        for start, size in chosen:
+            if k < size:
+                offset = self._ids_offset + 4 * (start + k)
+                return int.from_bytes(self._index[offset:offset + 4], 'little')
+            k -= size
+
+    def random_puzzle(self, levels, clues=None, rng=None):
+        """Return (puzzle, solution) strings for a random puzzle of the given levels, or None"""
+        i = self.random_id(levels, clues, rng)
+        if i is None:
+            return None
+        return self.puzzle(i), self.solution(i)
+
+    def records(self):
+        """Yield (puzzle, solution, level) for every record in file order"""
+        levels = bytearray(self.count)  # Level code per record, 0 if ungraded
+        for (level, _), (start, size) in self.buckets.items():
+            ids = array('I', self._index[self._ids_offset + 4 * start:self._ids_offset + 4 * (start + size)])
+            if sys.byteorder == 'big':
+                ids.byteswap()
+            for i in ids:
+                levels[i] = LEVEL_CODES[level]
+        for i in range(self.count):
+            yield self.puzzle(i), self.solution(i), LEVELS[levels[i]] if levels[i] else None
+
+    def close(self):
+        """Release the memory maps"""
+        for handle in (self._data, self._index, self._file, self._index_file):
+            if handle is not None:
+                handle.close()
+
+
+def main(argv=None):
+    """Build a corpus from a text file of 'puzzle [solution] [level]' lines"""
+    parser = argparse.ArgumentParser(description="Pack puzzles into a memory-mapped corpus.")
+    parser.add_argument('input', help="text file with one 'puzzle [solution] [level]' per line")
+    parser.add_argument('output', help="corpus file to write (index goes to <output>.idx)")
+    parser.add_argument('--no-solutions', action='store_true', help="store puzzles only")
+    args = parser.parse_args(argv)
+
+    with open(args.input) as f, CorpusWriter(args.output, not args.no_solutions) as writer:
+        for line in f:
+            fields = line.split()
+            if not fields:
+                continue
+            puzzle = fields[0]
+            solution = fields[1] if len(fields) > 1 else None
+            level = fields[2] if len(fields) > 2 else None
+            writer.add(puzzle, solution, level)
+    print(f"Wrote {writer.count} puzzles to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
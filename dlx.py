@@ -0,0 +1,244 @@
+"""
+Algorithm X / Dancing Links exact-cover solver for Sudoku of any box size
+
+A Sudoku of box size b has n = b*b digits and four families of n*n
+constraints (cell filled, row has digit, column has digit, box has digit).
+Every candidate placement is a row of the exact-cover matrix covering one
+constraint of each family. The links are stored in flat integer lists, which
+is considerably faster in Python than one object per node.
+"""
+
+import random
+
+
+class DancingLinks:
+    """Sparse exact-cover matrix with Knuth's dancing links"""
+
+    def __init__(self, num_columns):
+        # Node 0 is the root, nodes 1..num_columns are column headers
+        count = num_columns + 1
+        self.left = [i - 1 for i in range(count)]
+        self.right = [i + 1 for i in range(count)]
+        self.left[0] = num_columns
+        self.right[num_columns] = 0
+        self.up = list(range(count))
+        self.down = list(range(count))
+        self.column = list(range(count))
+        self.row_id = [None] * count
+        self.sizes = [0] * count
+
+    def add_row(self, row_id, columns):
+        """Add a matrix row covering the given column numbers (0-based)"""
+        left, right, up, down = self.left, self.right, self.up, self.down
+        first = None
+        for col in columns:
+            header = col + 1
+            node = len(left)
+            # Insert at the bottom of the column
+            up.append(up[header])
+            down.append(header)
+            down[up[header]] = node
+            up[header] = node
+            self.column.append(header)
+            self.row_id.append(row_id)
+            self.sizes[header] += 1
+            # Link into the row ring
+            if first is None:
+                first = node
+                left.append(node)
+                right.append(node)
+            else:
+                left.append(left[first])
+                right.append(first)
+                right[left[first]] = node
+                left[first] = node
+
+    def _cover(self, header):
+        left, right, up, down, column, sizes = (
+            self.left, self.right, self.up, self.down, self.column, self.sizes)
+        right[left[header]] = right[header]
+        left[right[header]] = left[header]
+        i = down[header]
+        while i != header:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                sizes[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def _uncover(self, header):
+        left, right, up, down, column, sizes = (
+            self.left, self.right, self.up, self.down, self.column, self.sizes)
+        i = up[header]
+        while i != header:
+            j = left[i]
+            while j != i:
+                sizes[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[header]] = header
+        left[right[header]] = header
+
+    def _choose_column(self):
+        """Pick the column with the fewest remaining rows"""
+        right, sizes = self.right, self.sizes
+        best = right[0]
+        best_size = sizes[best]
+        c = right[best]
+        while c != 0 and best_size > 1:
+            if sizes[c] < best_size:
+                best, best_size = c, sizes[c]
+            c = right[c]
+        return best
+
+    def solutions(self):
+        """Yield every exact cover as a list of row ids
+
+        The search is iterative so deep boards (25x25 has 625 levels) never
+        hit Python's recursion limit.
+        """
+        right, left, down, column = self.right, self.left, self.down, self.column
+        cols = []     # Column covered at each level
+        chosen = []   # Row node tried at each level
+        while True:
+            if right[0] == 0:
+                yield [self.row_id[r] for r in chosen]
+                advance = True
+            else:
+                c = self._choose_column()
+                self._cover(c)
+                cols.append(c)
+                chosen.append(down[c])
+                advance = False
+
+            # Apply the current row at the deepest level, or backtrack
+            while True:
+                if not cols:
+                    return
+                c = cols[-1]
+                r = chosen[-1]
+                if advance:
+                    j = left[r]
+                    while j != r:
+                        self._uncover(column[j])
+                        j = left[j]
+                    r = down[r]
+                    chosen[-1] = r
+                    advance = False
+                if r == c:
+                    # Every row in this column has been tried
+                    self._uncover(c)
+                    cols.pop()
+                    chosen.pop()
+                    advance = True
+                    continue
+                j = right[r]
+                while j != r:
+                    self._cover(column[j])
+                    j = right[j]
+                break
+
+
+def box_size_of(board):
+    """Return the box size for a square board (3 for 9x9, 4 for 16x16, ...)"""
+    return int(round(len(board) ** 0.5))
+
+
+def build_matrix(board, rng=None):
+    """Build the exact-cover matrix for a board (None or 0 for empty cells)
+
+    Returns None if the givens already conflict. When rng is given the
+    candidate rows are shuffled, which randomizes the first solution found.
+    """
+    box = box_size_of(board)
+    n = box * box
+    area = n * n
+    row_used = [set() for _ in range(n)]
+    col_used = [set() for _ in range(n)]
+    box_used = [set() for _ in range(n)]
+    for r in range(n):
+        for c in range(n):
+            value = board[r][c]
+            if value:
+                b = (r // box) * box + c // box
+                if value in row_used[r] or value in col_used[c] or value in box_used[b]:
+                    return None
+                row_used[r].add(value)
+                col_used[c].add(value)
+                box_used[b].add(value)
+
+    matrix = DancingLinks(4 * area)
+    cells = [(r, c) for r in range(n) for c in range(n)]
+    if rng is not None:
+        rng.shuffle(cells)
+    for r, c in cells:
+        b = (r // box) * box + c // box
+        value = board[r][c]
+        if value:
+            digits = [value]
+        else:
+            digits = [d for d in range(1, n + 1)
+                      if d not in row_used[r] and d not in col_used[c] and d not in box_used[b]]
+            if rng is not None:
+                rng.shuffle(digits)
+        for d in digits:
+            matrix.add_row((r, c, d), (
+                r * n + c,
+                area + r * n + d - 1,
+                2 * area + c * n + d - 1,
+                3 * area + b * n + d - 1,
+            ))
+    return matrix
+
+
+def solve(board, rng=None):
+    """Solve a board of any box size; return the solution as a list of lists, or None
+
+    Choosing the smallest column takes every naked and hidden single before
+    branching, which is all the propagation this search does. That keeps
+    9x9 and 16x16 boards in milliseconds, but 25x25 boards with 40-60% of
+    their cells empty sit near the hardness peak of the problem and can
+    take from seconds to many minutes (random restarts don't help, the
+    branching itself is too weak). The app never solves those: large games
+    are cut from a known solution by generate_solution and blank_cells.
+    """
+    matrix = build_matrix(board, rng)
+    if matrix is None:
+        return None
+    for rows in matrix.solutions():
+        solution = [[0] * len(board) for _ in range(len(board))]
+        for r, c, d in rows:
+            solution[r][c] = d
+        return solution
+    return None
+
+
+def generate_solution(box_size, rng=None):
+    """Generate a random completely filled board with the given box size
+
+    A randomized search from an empty 25x25 board can wander for a long
+    time, so start from the standard shifted pattern and shuffle it with
+    validity-preserving transformations (bands, stacks, rows and columns
+    within them, digit relabeling).
+    """
+    rng = rng or random.Random()
+    n = box_size * box_size
+
+    def shuffled_lines():
+        groups = rng.sample(range(box_size), box_size)
+        return [g * box_size + i for g in groups for i in rng.sample(range(box_size), box_size)]
+
+    rows = shuffled_lines()
+    cols = shuffled_lines()
+    digits = rng.sample(range(1, n + 1), n)
+    return [[digits[(box_size * (r % box_size) + r // box_size + c) % n] for c in cols] for r in rows]
+
+
+def blank_cells(solution, fraction, rng=None):
+    """Return a copy of a solved board with a random fraction of cells emptied"""
+    rng = rng or random.Random()
+    return [[None if rng.random() < fraction else value for value in row] for row in solution]
@@ -0,0 +1,90 @@
+"""
+Persistent embedding index for Arlo's knowledge base
+
+The chunks of the solving guide and their embedding vectors are saved in
+one binary file (little-endian):
+
+    header   magic b"SEMB", version u8, key (32 bytes), chunk count u32,
+             vector dimension u32
+    vectors  count * dimension float32
+    chunks   UTF-8 JSON list of {"text", "metadata"}
+
+The key is a SHA-256 over the PDF's bytes and the splitter and embedding
+parameters, so the index is rebuilt only when one of them changes. Storing
+vectors as float32 halves the file with no visible effect on similarity
+ranking. This module avoids langchain so the index can be checked before
+the AI stack is imported.
+"""
+
+import hashlib
+import json
+import struct
+import sys
+from array import array
+
+from fileutil import write_atomic
+
+MAGIC = b"SEMB"
+VERSION = 1
+HEADER = struct.Struct("<4sB3x32sII")
+
+
+def index_key(pdf_path, **params):
+    """Digest of the PDF contents and the parameters its index was built with"""
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    return digest.digest()
+
+
+def save_index(path, key, texts, metadatas, vectors):
+    """Write chunks and their vectors to path under key"""
+    dim = len(vectors[0]) if vectors else 0
+    packed = array('f')
+    for vector in vectors:
+        if len(vector) != dim:
+            raise ValueError("Embedding vectors differ in length")
+        packed.extend(vector)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    chunks = json.dumps([{'text': t, 'metadata': m} for t, m in zip(texts, metadatas)])
+    header = HEADER.pack(MAGIC, VERSION, key, len(texts), dim)
+    write_atomic(path, header + packed.tobytes() + chunks.encode('utf-8'))
+
+
+def load_index(path, key):
+    """Return (texts, metadatas, vectors) saved under key, or None if missing or stale"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        print(f"Error loading embedding index: {e}")
+        return None
+
+    if len(data) < HEADER.size:
+        return None
+    magic, version, saved_key, count, dim = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION or saved_key != key:
+        return None
+    vectors_end = HEADER.size + count * dim * 4
+    if len(data) < vectors_end:
+        return None
+    packed = array('f')
+    packed.frombytes(data[HEADER.size:vectors_end])
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    try:
+        chunks = json.loads(data[vectors_end:].decode('utf-8'))
+    except ValueError as e:
+        print(f"Error loading embedding index: {e}")
+        return None
+    if len(chunks) != count:
+        return None
+    texts = [chunk['text'] for chunk in chunks]
+    metadatas = [chunk['metadata'] for chunk in chunks]
+    vectors = [packed[i * dim:(i + 1) * dim].tolist() for i in range(count)]
+    return texts, metadatas, vectors
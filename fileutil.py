@@ -0,0 +1,13 @@
+"""
+Small file helpers shared by the modules that persist state
+"""
+
+import os
+
+
+def write_atomic(path, data):
+    """Replace a file's contents without ever leaving it half-written"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Super Sudoku Bulk Puzzle Generator
+
+Generates puzzle sets offline without starting the Qt application. Work is
+split into fixed-size chunks spread over a process pool, and every chunk is
+seeded from the base seed and its chunk number, so a run is reproducible no
+matter how many workers take part.
+
+Each output line holds an 81-character puzzle, its solution and the
+difficulty level, separated by spaces, with '0' marking empty cells:
+
+    python generate_puzzles.py --count 1000 --levels easy difficult -o puzzles.txt
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from puzzle_pool import DIFFICULTY_LEVELS, generate_puzzle
+from solver import to_string
+
+
+def generate_chunk(task):
+    """Generate one chunk of puzzles; runs inside a worker process"""
+    level, count, seed = task
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    lines = []
+    for _ in range(count):
+        puzzle, solution = generate_puzzle(level, rng)
+        lines.append(f"{to_string(puzzle)} {to_string(solution)} {level}\n")
+    return lines, time.perf_counter() - start
+
+
+def make_tasks(levels, count, chunk_size, seed):
+    """Split the requested work into (level, count, seed) chunks"""
+    tasks = []
+    for level in levels:
+        for chunk_index, start in enumerate(range(0, count, chunk_size)):
+            # String seeds hash deterministically across processes and runs
+            chunk_seed = random.Random(f"{seed}:{level}:{chunk_index}").getrandbits(64)
+            tasks.append((level, min(chunk_size, count - start), chunk_seed))
+    return tasks
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Generate Sudoku puzzles in bulk.")
+    parser.add_argument('-n', '--count', type=int, default=1000,
+                        help="puzzles to generate per difficulty level (default: 1000)")
+    parser.add_argument('-l', '--levels', nargs='+', choices=list(DIFFICULTY_LEVELS),
+                        default=list(DIFFICULTY_LEVELS), help="difficulty levels to generate")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: all cores)")
+    parser.add_argument('-c', '--chunk-size', type=int, default=250,
+                        help="puzzles per work unit (default: 250)")
+    parser.add_argument('-s', '--seed', type=int, default=0,
+                        help="base random seed (default: 0)")
+    parser.add_argument('-o', '--output', default='-',
+                        help="output file, or - for stdout (default: -)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main entry point"""
+    args = parse_args(argv)
+    tasks = make_tasks(args.levels, args.count, args.chunk_size, args.seed)
+    total = sum(count for _, count, _ in tasks)
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w')
+    start = time.perf_counter()
+    busy = 0.0
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            # map() yields chunks in submission order, so output is deterministic
+            for lines, elapsed in executor.map(generate_chunk, tasks):
+                out.writelines(lines)
+                done += len(lines)
+                busy += elapsed
+                print(f"\r{done}/{total} puzzles", end='', file=sys.stderr, flush=True)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    wall = time.perf_counter() - start
+    print(file=sys.stderr)
+    print(f"Generated {done} puzzles in {wall:.2f}s with {args.workers} workers", file=sys.stderr)
+    if wall > 0 and busy > 0:
+        print(f"Throughput: {done / wall:.1f} puzzles/sec overall, "
+              f"{done / busy:.1f} puzzles/sec per core", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Unique-solution puzzle generator for 9x9 Sudoku
+
+Starts from a random solved grid and digs holes in randomized symmetric
+order, keeping a removal only when the early-abort solution counter still
+finds exactly one solution. Optionally reduces the result to a minimal
+puzzle, where removing any remaining clue would allow a second solution.
+"""
+
+import random
+
+from solver import CELLS, count_solutions, solve_grid, unflatten
+
+
+def random_solution(rng=None):
+    """Return a random solved grid as a flat list of 81 ints"""
+    rng = rng or random.Random()
+    return solve_grid([0] * CELLS, rng)
+
+
+def dig(solution, target_clues=0, symmetric=True, rng=None):
+    """Remove clues from a solved grid while the puzzle stays unique
+
+    Cells are visited in random order, in pairs mirrored through the centre
+    when symmetric is set. Digging stops once the clue count reaches
+    target_clues or every cell has been tried.
+    """
+    rng = rng or random.Random()
+    puzzle = list(solution)
+    clues = CELLS
+
+    if symmetric:
+        groups = [(i, CELLS - 1 - i) if i != CELLS - 1 - i else (i,) for i in range(CELLS // 2 + 1)]
+    else:
+        groups = [(i,) for i in range(CELLS)]
+    rng.shuffle(groups)
+
+    for group in groups:
+        if clues - len(group) < target_clues:
+            continue
+        for i in group:
+            puzzle[i] = 0
+        if count_solutions(puzzle) == 1:
+            clues -= len(group)
+        else:
+            for i in group:
+                puzzle[i] = solution[i]
+        if clues <= target_clues:
+            break
+    return puzzle
+
+
+def reduce_to_minimal(puzzle, rng=None):
+    """Remove single clues until no clue can be removed without losing uniqueness"""
+    rng = rng or random.Random()
+    puzzle = list(puzzle)
+    cells = [i for i in range(CELLS) if puzzle[i]]
+    rng.shuffle(cells)
+    for i in cells:
+        value = puzzle[i]
+        puzzle[i] = 0
+        if count_solutions(puzzle) != 1:
+            puzzle[i] = value
+    return puzzle
+
+
+def is_minimal(puzzle):
+    """Check that every clue is needed for the puzzle to stay unique"""
+    puzzle = list(puzzle)
+    for i in range(CELLS):
+        value = puzzle[i]
+        if value:
+            puzzle[i] = 0
+            unique = count_solutions(puzzle) == 1
+            puzzle[i] = value
+            if unique:
+                return False
+    return True
+
+
+def generate(target_clues=0, symmetric=True, minimal=False, rng=None):
+    """Generate a puzzle with a unique solution
+
+    Returns (puzzle, solution) as 9x9 lists of lists, with None for the empty
+    cells of the puzzle so it matches py-sudoku's board format.
+    """
+    rng = rng or random.Random()
+    solution = random_solution(rng)
+    puzzle = dig(solution, target_clues, symmetric, rng)
+    if minimal:
+        puzzle = reduce_to_minimal(puzzle, rng)
+    board = [[value or None for value in row] for row in unflatten(puzzle)]
+    return board, unflatten(solution)
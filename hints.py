@@ -0,0 +1,101 @@
+"""
+Offline hints from a precomputed logical solve trace
+
+The trace for a puzzle is computed once (in the background when a game
+loads) with the human-technique solver. A hint is the next placement in the
+trace that is still missing from the player's board, together with the
+technique and any candidate eliminations that led to it. When the player
+fills correct cells the trace did not reach yet, the trace is rebuilt from
+the current board so hints stay deducible from what is actually there. If
+the techniques get stuck, the hint is the open cell with the fewest
+candidates left.
+"""
+
+from logical_solver import LogicalSolver, cell_name, describe_step, solve_logically
+from solver import CELLS, COL_OF, POPCOUNT, ROW_OF, flatten, mask_digits
+
+
+class HintEngine:
+    """Serves next-step hints for one puzzle from its logical solve trace"""
+
+    def __init__(self, puzzle, solution):
+        self.solution = flatten(solution)
+        self.rebuild(flatten(puzzle))
+
+    def correct_cells(self, grid):
+        """Return a copy of a flat grid keeping only the cells that match the solution"""
+        return [value if value == self.solution[i] else 0 for i, value in enumerate(grid)]
+
+    def rebuild(self, grid):
+        """Recompute the trace starting from the correct cells of a flat grid"""
+        self.base = self.correct_cells(grid)
+        self.steps = solve_logically(self.base).steps
+
+    def _find_in_trace(self, grid):
+        """Return (index of the next missing placement, cells known up to it)"""
+        known = {i for i in range(CELLS) if self.base[i]}
+        for index, step in enumerate(self.steps):
+            if step.placement:
+                cell, _ = step.placement
+                if grid[cell] != self.solution[cell]:
+                    return index, known
+                known.add(cell)
+        return None, known
+
+    def next_hint(self, board):
+        """Return the next deducible move for a board as a hint dict, or None if it is solved
+
+        The dict has row, col, value, technique and explanation keys; technique
+        is None when the logical techniques cannot make progress and the value
+        comes straight from the solution.
+        """
+        grid = flatten(board)
+        index, known = self._find_in_trace(grid)
+
+        # Correct cells the trace has not reached yet mean the player deviated
+        deviated = any(grid[i] == self.solution[i] and i not in known for i in range(CELLS))
+        if deviated:
+            self.rebuild(grid)
+            index, known = self._find_in_trace(grid)
+
+        if index is None:
+            return self._fallback_hint(grid)
+
+        # Eliminations since the previous placement explain this one
+        start = index
+        while start > 0 and not self.steps[start - 1].placement:
+            start -= 1
+        steps = self.steps[start:index + 1]
+        cell, value = self.steps[index].placement
+        return {
+            'row': ROW_OF[cell],
+            'col': COL_OF[cell],
+            'value': value,
+            'technique': self.steps[index].technique,
+            'explanation': "\n".join(f"- {describe_step(step)}" for step in steps),
+        }
+
+    def _fallback_hint(self, grid):
+        """Hint the open cell with the fewest candidates left, straight from the solution
+
+        Used when the techniques are stuck. The candidates are what the
+        techniques leave on the correct cells, so the hinted cell is the one
+        closest to being decided, the easiest for the player to check.
+        """
+        open_cells = [cell for cell in range(CELLS) if grid[cell] != self.solution[cell]]
+        if not open_cells:
+            return None
+        solver = LogicalSolver(self.correct_cells(grid))
+        solver.solve()
+        cell = min(open_cells, key=lambda cell: POPCOUNT[solver.cands[cell]] or 1)
+        value = self.solution[cell]
+        candidates = mask_digits(solver.cands[cell]) or [value]
+        return {
+            'row': ROW_OF[cell],
+            'col': COL_OF[cell],
+            'value': value,
+            'technique': None,
+            'explanation': (f"No technique I know applies here. {cell_name(cell)} has the fewest "
+                            f"candidates left ({', '.join(map(str, candidates))}), and {value} goes "
+                            f"there. Press Explain to have Arlo reason it through."),
+        }
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Streaming importer for external puzzle files
+
+Supported formats:
+
+    lines   one puzzle per line as 81 characters, '.' or '0' for empty cells,
+            optionally followed by a solution and a level (generate_puzzles.py)
+    sdk     .sdk grids: nine rows of nine cells, '#' or '[' lines are metadata
+    csv     puzzle and solution columns (header names like puzzle/quizzes and
+            solution/solutions are recognized; without a header the first two
+            columns are used)
+
+Everything is generator based: files are read in large chunks, split into
+lines, parsed, normalized and validated lazily, so multi-GB files can be
+filtered, deduplicated or packed into a corpus in constant memory (apart
+from the set of seen puzzles when deduplicating).
+
+    python importer.py puzzles.csv -o puzzles.corpus --dedupe --grade
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from collections import namedtuple
+
+from corpus import LEVEL_CODES, Corpus, CorpusWriter, index_path, pack
+from logical_solver import grade as grade_puzzle
+from solver import CELLS, UNITS, initial_state, solve_grid
+
+CHUNK_SIZE = 1 << 20  # 1 MiB reads
+PROGRESS_EVERY = 10000  # Records between progress callbacks
+EMPTY_CHARS = ".0*_-xX"
+
+# puzzle and solution are 81-character digit strings with '0' for empty
+# cells; solution and level may be None
+Record = namedtuple("Record", "puzzle solution level")
+
+CSV_PUZZLE_COLUMNS = ("puzzle", "puzzles", "quiz", "quizzes", "question")
+CSV_SOLUTION_COLUMNS = ("solution", "solutions", "answer")
+CSV_LEVEL_COLUMNS = ("level", "difficulty")
+
+
+class ImportCancelled(Exception):
+    """Raised when a progress callback asks to stop"""
+
+
+class ImportStats:
+    """Running counters for an import, passed to progress callbacks"""
+
+    def __init__(self):
+        self.read = 0
+        self.invalid = 0
+        self.duplicates = 0
+        self.valid = 0  # Well-formed records read
+        self.imported = 0  # New records written to storage
+        self.bytes_read = 0
+        self.started = time.perf_counter()
+
+    @property
+    def rate(self):
+        """Records read per second so far"""
+        elapsed = time.perf_counter() - self.started
+        return self.read / elapsed if elapsed > 0 else 0.0
+
+
+def read_lines(path, stats=None, chunk_size=CHUNK_SIZE):
+    """Yield lines from a file read in large chunks"""
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        tail = ""
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            if stats is not None:
+                stats.bytes_read += len(chunk)
+            lines = (tail + chunk).splitlines()
+            # The last line may continue in the next chunk
+            tail = lines.pop() if lines and not chunk.endswith(("\n", "\r")) else ""
+            yield from lines
+        if tail:
+            yield tail
+
+
+def normalize(text):
+    """Return an 81-character digit string for a board, or None if malformed"""
+    if text is None:
+        return None
+    text = text.strip()
+    if len(text) != CELLS:
+        return None
+    for ch in EMPTY_CHARS:
+        text = text.replace(ch, "0")
+    return text if text.isdigit() else None
+
+
+def parse_lines(lines):
+    """Parse 'puzzle [solution] [level]' lines into raw (puzzle, solution, level) tuples"""
+    for line in lines:
+        fields = line.split()
+        if not fields or fields[0].startswith("#"):
+            continue
+        yield (fields[0],
+               fields[1] if len(fields) > 1 else None,
+               fields[2] if len(fields) > 2 else None)
+
+
+def parse_sdk(lines):
+    """Parse .sdk grids (nine rows of nine cells, separators ignored)"""
+    rows = []
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith(("#", "[")):
+            continue
+        cells = "".join(ch for ch in stripped if ch not in "|+- \t")
+        if len(cells) != 9:
+            # Separator lines like '------+------' vanish above; anything else resets
+            if cells:
+                rows = []
+            continue
+        rows.append(cells)
+        if len(rows) == 9:
+            yield "".join(rows), None, None
+            rows = []
+
+
+def parse_csv(lines):
+    """Parse CSV rows with puzzle and optional solution/level columns"""
+    reader = csv.reader(lines)
+    puzzle_col, solution_col, level_col = 0, 1, None
+    for row in reader:
+        if not row:
+            continue
+        if reader.line_num == 1:
+            header = [name.strip().lower() for name in row]
+            if any(name in CSV_PUZZLE_COLUMNS for name in header):
+                puzzle_col = next(i for i, name in enumerate(header) if name in CSV_PUZZLE_COLUMNS)
+                solution_col = next((i for i, name in enumerate(header) if name in CSV_SOLUTION_COLUMNS), None)
+                level_col = next((i for i, name in enumerate(header) if name in CSV_LEVEL_COLUMNS), None)
+                continue
+        yield (row[puzzle_col] if puzzle_col < len(row) else None,
+               row[solution_col] if solution_col is not None and solution_col < len(row) else None,
+               row[level_col] if level_col is not None and level_col < len(row) else None)
+
+
+PARSERS = {"lines": parse_lines, "sdk": parse_sdk, "csv": parse_csv}
+
+
+def detect_format(path):
+    """Guess the format from the file extension"""
+    ext = os.path.splitext(str(path))[1].lower()
+    if ext == ".sdk":
+        return "sdk"
+    if ext == ".csv":
+        return "csv"
+    return "lines"
+
+
+def is_valid_solution(puzzle, solution):
+    """Check that a solution is complete, consistent and matches the puzzle's givens"""
+    if "0" in solution:
+        return False
+    if any(p != "0" and p != s for p, s in zip(puzzle, solution)):
+        return False
+    return all(len({solution[i] for i in unit}) == 9 for unit in UNITS)
+
+
+def validate(puzzle, solution):
+    """Check that the givens don't conflict and that any solution fits"""
+    if initial_state([int(ch) for ch in puzzle]) is None:
+        return False
+    return solution is None or is_valid_solution(puzzle, solution)
+
+
+def iter_records(path, fmt=None, dedupe=False, progress=None, stats=None,
+                 progress_every=PROGRESS_EVERY):
+    """Yield valid, normalized Records from a puzzle file
+
+    progress(stats) is called every progress_every records read; returning
+    False cancels the import with ImportCancelled.
+    """
+    stats = stats if stats is not None else ImportStats()
+    parser = PARSERS[fmt or detect_format(path)]
+    seen = set()
+
+    for raw_puzzle, raw_solution, level in parser(read_lines(path, stats)):
+        stats.read += 1
+        if progress is not None and stats.read % progress_every == 0:
+            if progress(stats) is False:
+                raise ImportCancelled()
+
+        puzzle = normalize(raw_puzzle)
+        solution = normalize(raw_solution)
+        if puzzle is None or (raw_solution and solution is None) or not validate(puzzle, solution):
+            stats.invalid += 1
+            continue
+        if dedupe:
+            key = pack(puzzle)
+            if key in seen:
+                stats.duplicates += 1
+                continue
+            seen.add(key)
+        stats.valid += 1
+        yield Record(puzzle, solution, level.strip().lower() if level else None)
+
+
+def complete_record(record, grade=False):
+    """Fill in a missing solution (and level when grading); None if unsolvable
+
+    Level names the corpus does not know (e.g. 'hard') are dropped.
+    """
+    solution = record.solution
+    if solution is None:
+        grid = solve_grid([int(ch) for ch in record.puzzle])
+        if grid is None:
+            return None
+        solution = "".join(map(str, grid))
+    level = record.level if record.level in LEVEL_CODES else None
+    if grade and not level:
+        level = grade_puzzle([int(ch) for ch in record.puzzle])
+    return Record(record.puzzle, solution, level)
+
+
+def import_to_corpus(paths, corpus_path, fmt=None, dedupe=False, grade=False, progress=None,
+                     progress_every=PROGRESS_EVERY):
+    """Stream puzzle files into a corpus, merging with an existing one
+
+    The new corpus is written next to the old one and swapped in when done.
+    Memory use is constant unless dedupe is set, which remembers every
+    puzzle seen. Returns the ImportStats.
+    """
+    stats = ImportStats()
+    tmp_path = f"{corpus_path}.tmp"
+    seen = set()
+
+    def existing_records():
+        if not os.path.exists(corpus_path):
+            return
+        corpus = Corpus(corpus_path)
+        try:
+            for puzzle, solution, level in corpus.records():
+                yield Record(puzzle, solution, level), False
+        finally:
+            corpus.close()
+
+    def new_records():
+        for path in paths:
+            for record in iter_records(path, fmt, progress=progress, stats=stats,
+                                       progress_every=progress_every):
+                yield record, True
+
+    try:
+        with CorpusWriter(tmp_path) as writer:
+            for source in (existing_records(), new_records()):
+                for record, is_new in source:
+                    if dedupe:
+                        key = pack(record.puzzle)
+                        if key in seen:
+                            stats.duplicates += 1
+                            continue
+                        seen.add(key)
+                    record = complete_record(record, grade)
+                    if record is None:
+                        stats.invalid += 1
+                        continue
+                    writer.add(record.puzzle, record.solution, record.level)
+                    stats.imported += is_new
+    except BaseException:
+        for path in (tmp_path, index_path(tmp_path)):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    os.replace(tmp_path, corpus_path)
+    os.replace(index_path(tmp_path), index_path(corpus_path))
+    return stats
+
+
+def main(argv=None):
+    """Convert puzzle files into a corpus"""
+    parser = argparse.ArgumentParser(description="Import puzzle files into a Super Sudoku corpus.")
+    parser.add_argument('inputs', nargs='+', help="puzzle files to import")
+    parser.add_argument('-o', '--output', required=True, help="corpus file to create or extend")
+    parser.add_argument('-f', '--format', choices=list(PARSERS), help="input format (default: by extension)")
+    parser.add_argument('--dedupe', action='store_true', help="skip repeated puzzles")
+    parser.add_argument('--grade', action='store_true', help="grade ungraded puzzles by technique")
+    args = parser.parse_args(argv)
+
+    def report(stats):
+        print(f"\r{stats.read} records, {stats.rate:.0f} records/sec", end='', file=sys.stderr, flush=True)
+
+    stats = import_to_corpus(args.inputs, args.output, args.format, args.dedupe, args.grade, report)
+    print(file=sys.stderr)
+    print(f"Imported {stats.imported} puzzles ({stats.invalid} invalid, {stats.duplicates} duplicates) "
+          f"at {stats.rate:.0f} records/sec", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
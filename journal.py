@@ -0,0 +1,120 @@
+"""
+Undo/redo journal for board edits
+
+Every move is packed into one 32-bit entry of an array:
+
+    bits  0-9   cell index (boards up to 25x25)
+    bits 10-14  old value
+    bits 15-19  new value
+    bits 20-31  flags (FLAG_HINT: the move placed a hint)
+
+Every K moves a full copy of the board (Board.to_bytes()) is stored as a
+checkpoint, so undo, redo and jumping to any move replay at most K entries
+no matter how long the game is, at roughly 4 bytes per move plus one small
+checkpoint per K moves.
+"""
+
+from array import array
+
+from board import Board
+
+CHECKPOINT_INTERVAL = 64
+FLAG_HINT = 1
+
+_CELL_BITS = 10
+_VALUE_BITS = 5
+_CELL_MASK = (1 << _CELL_BITS) - 1
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+_OLD_SHIFT = _CELL_BITS
+_NEW_SHIFT = _CELL_BITS + _VALUE_BITS
+_FLAGS_SHIFT = _CELL_BITS + 2 * _VALUE_BITS
+
+
+def pack_move(cell, old, new, flags=0):
+    """Pack a move into a 32-bit journal entry"""
+    return cell | old << _OLD_SHIFT | new << _NEW_SHIFT | flags << _FLAGS_SHIFT
+
+
+def unpack_move(entry):
+    """Unpack a journal entry into (cell, old, new, flags)"""
+    return (entry & _CELL_MASK,
+            entry >> _OLD_SHIFT & _VALUE_MASK,
+            entry >> _NEW_SHIFT & _VALUE_MASK,
+            entry >> _FLAGS_SHIFT)
+
+
+class Journal:
+    """Move history for one Board with periodic full-board checkpoints
+
+    The journal does not edit the board when a move is recorded (the caller
+    has already made the change), but undo, redo and jump_to apply the moves
+    to the board themselves.
+    """
+
+    def __init__(self, board, checkpoint_interval=CHECKPOINT_INTERVAL):
+        self.board = board
+        self.interval = checkpoint_interval
+        self.entries = array('I')
+        self.position = 0  # Number of moves currently applied
+        self.checkpoints = [board.to_bytes()]  # checkpoints[i] is the board after i * interval moves
+
+    def __len__(self):
+        return len(self.entries)
+
+    def can_undo(self):
+        return self.position > 0
+
+    def can_redo(self):
+        return self.position < len(self.entries)
+
+    def record(self, row, col, old, new, flags=0):
+        """Record a move that was just made, discarding any redo history"""
+        if self.position < len(self.entries):
+            del self.entries[self.position:]
+            del self.checkpoints[self.position // self.interval + 1:]
+        self.entries.append(pack_move(row * self.board.size + col, old, new, flags))
+        self.position += 1
+        if self.position % self.interval == 0:
+            self.checkpoints.append(self.board.to_bytes())
+
+    def _apply(self, entry, forward):
+        """Apply one entry to the board and return (row, col, value)"""
+        cell, old, new, flags = unpack_move(entry)
+        value = new if forward else old
+        self.board.cells[cell] = value
+        if flags & FLAG_HINT:
+            if forward:
+                self.board.hint_mask |= 1 << cell
+            else:
+                self.board.hint_mask &= ~(1 << cell)
+        return divmod(cell, self.board.size) + (value,)
+
+    def undo(self):
+        """Revert the last move and return (row, col, value), or None if there is nothing to undo"""
+        if not self.can_undo():
+            return None
+        self.position -= 1
+        return self._apply(self.entries[self.position], False)
+
+    def redo(self):
+        """Reapply the next undone move and return (row, col, value), or None"""
+        if not self.can_redo():
+            return None
+        self.position += 1
+        return self._apply(self.entries[self.position - 1], True)
+
+    def jump_to(self, move):
+        """Put the board in its state after the given number of moves
+
+        Restores the nearest checkpoint at or before the move and replays at
+        most interval - 1 entries from there.
+        """
+        move = max(0, min(move, len(self.entries)))
+        index = move // self.interval
+        restored = Board.from_bytes(self.checkpoints[index])
+        self.board.cells[:] = restored.cells
+        self.board.given_mask = restored.given_mask
+        self.board.hint_mask = restored.hint_mask
+        for entry in self.entries[index * self.interval:move]:
+            self._apply(entry, True)
+        self.position = move
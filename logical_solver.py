@@ -0,0 +1,291 @@
+"""
+Human-technique logical solver and difficulty grading for 9x9 Sudoku
+
+Applies the techniques Arlo is asked to reason with, always picking the
+easiest one that makes progress, over bitmask candidates:
+
+    naked single, hidden single, pointing pair, box/line reduction,
+    naked pair, hidden pair, naked triple, hidden triple, X-wing, XY-wing,
+    swordfish
+
+Every step is recorded (technique, cells involved, placement and candidate
+eliminations) and a puzzle is graded by the hardest technique it needs.
+"""
+
+from collections import namedtuple
+from itertools import combinations
+
+from solver import (ALL_DIGITS, BOX_OF, BOXES, CELLS, COL_OF, COLS, DIGIT_OF_BIT, PEERS,
+                    POPCOUNT, ROW_OF, ROWS, UNITS, bit, flatten, initial_state, mask_digits)
+
+# Techniques in the order they are tried, with their difficulty rank
+TECHNIQUES = (
+    ("naked_single", 1),
+    ("hidden_single", 1),
+    ("pointing_pair", 2),
+    ("box_line_reduction", 2),
+    ("naked_pair", 3),
+    ("hidden_pair", 3),
+    ("naked_triple", 3),
+    ("hidden_triple", 3),
+    ("x_wing", 3),
+    ("xy_wing", 3),
+    ("swordfish", 3),
+)
+TECHNIQUE_RANK = dict(TECHNIQUES)
+UNSOLVED_RANK = 4  # Needs something beyond the techniques above
+
+# Difficulty level for each rank
+LEVELS = {1: "easy", 2: "medium", 3: "difficult", UNSOLVED_RANK: "expert"}
+
+# cells: cells that justify the step; placement: (cell, digit) or None;
+# eliminations: list of (cell, digit) candidates removed
+Step = namedtuple("Step", "technique cells placement eliminations")
+
+# solved: whether the techniques finished the puzzle; grid: flat final grid;
+# score: rank of the hardest technique needed; level: name for that rank
+SolveResult = namedtuple("SolveResult", "solved steps score level grid")
+
+UNIT_NAMES = tuple(f"row {i + 1}" for i in range(9)) + \
+    tuple(f"column {i + 1}" for i in range(9)) + tuple(f"box {i + 1}" for i in range(9))
+
+
+def cell_name(cell):
+    """Return a cell as 'r3c5' (1-based)"""
+    return f"r{ROW_OF[cell] + 1}c{COL_OF[cell] + 1}"
+
+
+def describe_step(step):
+    """Return a short human-readable description of a step"""
+    name = step.technique.replace("_", " ")
+    if step.placement:
+        cell, digit = step.placement
+        return f"{name}: {digit} goes in {cell_name(cell)}"
+    removed = ", ".join(f"{digit} from {cell_name(cell)}" for cell, digit in step.eliminations)
+    cells = ", ".join(cell_name(cell) for cell in step.cells)
+    return f"{name} on {cells}: remove {removed}"
+
+
+class LogicalSolver:
+    """Step-by-step solver that only uses human techniques"""
+
+    def __init__(self, board):
+        grid = flatten(board) if len(board) == 9 else list(board)
+        state = initial_state(grid)
+        if state is None:
+            raise ValueError("Puzzle has conflicting givens")
+        self.grid, self.cands, _ = state
+        self.steps = []
+
+    def is_solved(self):
+        """Check if every cell has been filled"""
+        return all(self.grid)
+
+    def place(self, cell, digit):
+        """Fill a cell and remove the digit from its peers"""
+        self.grid[cell] = digit
+        self.cands[cell] = 0
+        b = bit(digit)
+        for p in PEERS[cell]:
+            self.cands[p] &= ~b
+
+    def eliminate(self, eliminations):
+        """Remove candidates listed as (cell, digit) pairs"""
+        for cell, digit in eliminations:
+            self.cands[cell] &= ~bit(digit)
+
+    # Techniques: each returns a Step without applying it, or None
+
+    def find_naked_single(self):
+        for cell in range(CELLS):
+            m = self.cands[cell]
+            if m and not m & (m - 1):
+                return Step("naked_single", (cell,), (cell, DIGIT_OF_BIT[m]), [])
+        return None
+
+    def find_hidden_single(self):
+        for unit in UNITS:
+            for digit in range(1, 10):
+                b = bit(digit)
+                cells = [cell for cell in unit if self.cands[cell] & b]
+                if len(cells) == 1:
+                    return Step("hidden_single", tuple(unit), (cells[0], digit), [])
+        return None
+
+    def find_pointing_pair(self):
+        """Digit confined to one row or column of a box: remove it from the rest of that line"""
+        for box in BOXES:
+            for digit in range(1, 10):
+                b = bit(digit)
+                cells = [cell for cell in box if self.cands[cell] & b]
+                if len(cells) < 2:
+                    continue
+                for line_of, lines in ((ROW_OF, ROWS), (COL_OF, COLS)):
+                    if len({line_of[cell] for cell in cells}) == 1:
+                        line = lines[line_of[cells[0]]]
+                        eliminations = [(cell, digit) for cell in line
+                                        if cell not in box and self.cands[cell] & b]
+                        if eliminations:
+                            return Step("pointing_pair", tuple(cells), None, eliminations)
+        return None
+
+    def find_box_line_reduction(self):
+        """Digit confined to one box within a line: remove it from the rest of that box"""
+        for line in ROWS + COLS:
+            for digit in range(1, 10):
+                b = bit(digit)
+                cells = [cell for cell in line if self.cands[cell] & b]
+                if len(cells) < 2 or len({BOX_OF[cell] for cell in cells}) != 1:
+                    continue
+                box = BOXES[BOX_OF[cells[0]]]
+                eliminations = [(cell, digit) for cell in box
+                                if cell not in line and self.cands[cell] & b]
+                if eliminations:
+                    return Step("box_line_reduction", tuple(cells), None, eliminations)
+        return None
+
+    def _find_naked_subset(self, size, technique):
+        """size cells of a unit sharing exactly size candidates: remove those elsewhere in the unit"""
+        for unit in UNITS:
+            empty = [cell for cell in unit if self.cands[cell] and POPCOUNT[self.cands[cell]] <= size]
+            for subset in combinations(empty, size):
+                union = 0
+                for cell in subset:
+                    union |= self.cands[cell]
+                if POPCOUNT[union] != size:
+                    continue
+                eliminations = [(cell, digit) for cell in unit if cell not in subset
+                                for digit in mask_digits(self.cands[cell] & union)]
+                if eliminations:
+                    return Step(technique, subset, None, eliminations)
+        return None
+
+    def _find_hidden_subset(self, size, technique):
+        """size digits confined to size cells of a unit: remove other digits from those cells"""
+        for unit in UNITS:
+            places = {}
+            for digit in range(1, 10):
+                b = bit(digit)
+                cells = [cell for cell in unit if self.cands[cell] & b]
+                if 2 <= len(cells) <= size:
+                    places[digit] = cells
+            for digits in combinations(places, size):
+                subset = sorted({cell for digit in digits for cell in places[digit]})
+                if len(subset) != size:
+                    continue
+                keep = 0
+                for digit in digits:
+                    keep |= bit(digit)
+                eliminations = [(cell, digit) for cell in subset
+                                for digit in mask_digits(self.cands[cell] & ~keep)]
+                if eliminations:
+                    return Step(technique, tuple(subset), None, eliminations)
+        return None
+
+    def _find_fish(self, size, technique):
+        """Digit confined to the same size columns in size rows (or the reverse): remove it
+        from the rest of those columns"""
+        for lines, line_of, cross_lines, cross_of in ((ROWS, ROW_OF, COLS, COL_OF),
+                                                      (COLS, COL_OF, ROWS, ROW_OF)):
+            for digit in range(1, 10):
+                b = bit(digit)
+                bases = {}
+                for index, line in enumerate(lines):
+                    cells = [cell for cell in line if self.cands[cell] & b]
+                    if 2 <= len(cells) <= size:
+                        bases[index] = cells
+                for chosen in combinations(bases, size):
+                    cells = [cell for index in chosen for cell in bases[index]]
+                    crosses = {cross_of[cell] for cell in cells}
+                    if len(crosses) != size:
+                        continue
+                    eliminations = [(cell, digit) for cross in sorted(crosses)
+                                    for cell in cross_lines[cross]
+                                    if line_of[cell] not in chosen and self.cands[cell] & b]
+                    if eliminations:
+                        return Step(technique, tuple(cells), None, eliminations)
+        return None
+
+    def find_naked_pair(self):
+        return self._find_naked_subset(2, "naked_pair")
+
+    def find_hidden_pair(self):
+        return self._find_hidden_subset(2, "hidden_pair")
+
+    def find_naked_triple(self):
+        return self._find_naked_subset(3, "naked_triple")
+
+    def find_hidden_triple(self):
+        return self._find_hidden_subset(3, "hidden_triple")
+
+    def find_x_wing(self):
+        return self._find_fish(2, "x_wing")
+
+    def find_swordfish(self):
+        return self._find_fish(3, "swordfish")
+
+    def find_xy_wing(self):
+        """Pivot {x, y} seeing pincers {x, z} and {y, z}: remove z from cells seeing both pincers"""
+        pairs = [cell for cell in range(CELLS) if POPCOUNT[self.cands[cell]] == 2]
+        for pivot in pairs:
+            pivot_mask = self.cands[pivot]
+            peers = set(PEERS[pivot])
+            wings = [cell for cell in pairs if cell in peers
+                     and POPCOUNT[self.cands[cell] & pivot_mask] == 1]
+            for first, second in combinations(wings, 2):
+                shared = self.cands[first] & self.cands[second]
+                if (POPCOUNT[shared] != 1 or shared & pivot_mask
+                        or self.cands[first] & self.cands[second] & pivot_mask
+                        or (self.cands[first] | self.cands[second]) & pivot_mask != pivot_mask):
+                    continue
+                digit = DIGIT_OF_BIT[shared]
+                seen = set(PEERS[first]) & set(PEERS[second])
+                eliminations = [(cell, digit) for cell in sorted(seen)
+                                if cell != pivot and self.cands[cell] & shared]
+                if eliminations:
+                    return Step("xy_wing", (pivot, first, second), None, eliminations)
+        return None
+
+    def next_step(self):
+        """Find the easiest applicable step, or None if the techniques are stuck"""
+        for technique, _ in TECHNIQUES:
+            step = getattr(self, f"find_{technique}")()
+            if step is not None:
+                return step
+        return None
+
+    def apply(self, step):
+        """Apply a step and add it to the trace"""
+        if step.placement:
+            self.place(*step.placement)
+        self.eliminate(step.eliminations)
+        self.steps.append(step)
+
+    def has_contradiction(self):
+        """Check for an empty cell with no candidates left"""
+        return any(not self.grid[cell] and not self.cands[cell] for cell in range(CELLS))
+
+    def solve(self):
+        """Apply steps until solved or stuck, and grade the result"""
+        while not self.is_solved() and not self.has_contradiction():
+            step = self.next_step()
+            if step is None:
+                break
+            self.apply(step)
+
+        solved = self.is_solved()
+        if solved:
+            score = max((TECHNIQUE_RANK[step.technique] for step in self.steps), default=1)
+        else:
+            score = UNSOLVED_RANK
+        return SolveResult(solved, self.steps, score, LEVELS[score], list(self.grid))
+
+
+def solve_logically(board):
+    """Solve a 9x9 board (or flat grid) with human techniques; return a SolveResult"""
+    return LogicalSolver(board).solve()
+
+
+def grade(board):
+    """Return the difficulty level name for a 9x9 board (or flat grid)"""
+    return solve_logically(board).level
@@ -0,0 +1,54 @@
+"""
+Markdown rendering for Arlo's responses
+
+markdown_to_html() handles the small markdown subset Arlo uses: bold,
+italic, bullet and numbered lists, and line breaks. Every rule works
+within a single line, so a streamed response can be rendered line by line:
+IncrementalMarkdown formats each completed line once and re-formats only
+the unfinished tail as new chunks arrive.
+"""
+
+import re
+
+
+def render_line(line):
+    """Convert one line of markdown to HTML"""
+    # Convert **bold** to <b>bold</b>
+    line = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', line)
+    # Convert *italic* to <i>italic</i>
+    line = re.sub(r'\*(.*?)\*', r'<i>\1</i>', line)
+    # Convert bullet points
+    line = re.sub(r'^- (.*?)$', r'• \1', line)
+    # Convert numbered lists
+    return re.sub(r'^(\d+)\. (.*?)$', r'<b>\1.</b> \2', line)
+
+
+def markdown_to_html(text):
+    """Convert basic markdown to HTML for display"""
+    return '<br>'.join(render_line(line) for line in text.split('\n'))
+
+
+class IncrementalMarkdown:
+    """Renders a markdown stream, formatting each completed line only once"""
+
+    def __init__(self):
+        self.tail = ""  # Text after the last newline
+        self.started = False  # Whether any chunk has arrived
+
+    def feed(self, chunk):
+        """Add a chunk; return (HTML for newly completed lines, HTML for the tail)
+
+        The completed HTML is final and can be appended for good; the tail
+        HTML replaces the previous tail.
+        """
+        self.started = True
+        text = self.tail + chunk
+        lines = text.split('\n')
+        self.tail = lines.pop()
+        done = ''.join(render_line(line) + '<br>' for line in lines)
+        return done, render_line(self.tail)
+
+    def finish(self):
+        """Return the final HTML for the tail"""
+        tail, self.tail = self.tail, ""
+        return render_line(tail)
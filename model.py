@@ -1,5 +1,6 @@
 import os
 from langchain_community.document_loaders import PyPDFLoader
+from langchain_core.embeddings import Embeddings
 from langchain_core.vectorstores import InMemoryVectorStore
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 from langchain_text_splitters import RecursiveCharacterTextSplitter
@@ -7,9 +8,33 @@ from langchain.chains import create_retrieval_chain
 from langchain.chains.combine_documents import create_stuff_documents_chain
 from langchain_core.prompts import ChatPromptTemplate
 from config import config
+from embedding_index import index_key, load_index, save_index
+from response_cache import ResponseCache
+
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+EMBED_BATCH = 16  # Passages per embedding request; progress is reported between requests
+
+class SavedEmbeddings(Embeddings):
+    """Embeddings that reuse known passage vectors and embed anything else with the real model"""
+    
+    def __init__(self, embeddings, texts, vectors):
+        self.embeddings = embeddings
+        self.known = dict(zip(texts, vectors))
+    
+    def embed_documents(self, texts):
+        missing = [text for text in texts if text not in self.known]
+        if missing:
+            self.known.update(zip(missing, self.embeddings.embed_documents(missing)))
+        return [self.known[text] for text in texts]
+    
+    def embed_query(self, text):
+        return self.embeddings.embed_query(text)
 
 class SudokuAI:
-    def __init__(self):
+    def __init__(self, progress=None):
+        """Set up the RAG chain; progress, if given, is called with a description of each stage"""
+        self.progress = progress or (lambda stage: None)
         # Get API key from config system
         api_key = config.get_openai_api_key()
         if not api_key:
@@ -18,31 +43,21 @@ class SudokuAI:
         os.environ["OPENAI_API_KEY"] = api_key
         
         self.llm = ChatOpenAI(model="gpt-4o")
+        self.cache = ResponseCache(config.config_dir / "responses.json")
         self.rag_chain = None
         self._setup_rag()
     
     def _setup_rag(self):
-        # Load and process the PDF using config system
-        file_path = config.get_pdf_path()
-        loader = PyPDFLoader(file_path)
-        docs = loader.load()
-        
-        # Split documents
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-        splits = text_splitter.split_documents(docs)
-        
-        # Create vector store and retriever
-        vectorstore = InMemoryVectorStore.from_documents(
-            documents=splits, embedding=OpenAIEmbeddings()
-        )
+        vectorstore = self._load_vectorstore(config.get_pdf_path())
         retriever = vectorstore.as_retriever()
         
         # Create the RAG chain
+        self.progress("Building the answer chain...")
         system_prompt = (
             "You are an expert Sudoku assistant helping players improve their solving skills. "
             "Analyze the current puzzle state and provide helpful guidance using standard Sudoku solving techniques. "
             "When giving hints or explanations, work through the logic step by step using techniques like: "
-            "elimination, naked singles, hidden singles, pointing pairs, box/line reduction, naked pairs/triples, etc. "
+            "elimination, naked singles, hidden singles, pointing pairs, box/line reduction, naked and hidden pairs/triples, X-wings, XY-wings, swordfish, etc. "
             "Format your responses using markdown for better readability (use **bold** for emphasis, bullet points for steps, etc.). "
             "Never mention that you have access to the solution - instead, present your reasoning as if you're solving it naturally. "
             "Only at the very end of your explanation, if providing a specific move, you may briefly mention verification."
@@ -58,57 +73,111 @@ class SudokuAI:
         question_answer_chain = create_stuff_documents_chain(self.llm, prompt)
         self.rag_chain = create_retrieval_chain(retriever, question_answer_chain)
     
-    def get_hint(self, current_board, solution_board):
-        """Get a hint for the next move from the AI"""
-        input_text = f"Analyze this Sudoku puzzle and suggest the next logical move:\n\nCurrent state: {current_board}\n\nPlease identify the best next move and explain the reasoning using standard Sudoku techniques."
+    def _load_vectorstore(self, file_path):
+        """Build the vector store from the saved index, embedding the PDF only if it changed"""
+        embeddings = OpenAIEmbeddings()
+        index_path = config.config_dir / "embeddings.idx"
+        key = index_key(file_path, chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP,
+                        model=embeddings.model, dimensions=embeddings.dimensions)
+        self.progress("Loading the saved guide index...")
+        saved = load_index(index_path, key)
+        if saved:
+            texts, metadatas, vectors = saved
+        else:
+            # Load and split the PDF, then embed every chunk (one round of API calls)
+            self.progress("Reading the solving guide...")
+            docs = PyPDFLoader(file_path).load()
+            self.progress("Splitting the guide into passages...")
+            text_splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+            splits = text_splitter.split_documents(docs)
+            texts = [doc.page_content for doc in splits]
+            metadatas = [doc.metadata for doc in splits]
+            vectors = []
+            for start in range(0, len(texts), EMBED_BATCH):
+                end = min(start + EMBED_BATCH, len(texts))
+                self.progress(f"Embedding passages {start + 1}-{end} of {len(texts)}...")
+                vectors.extend(embeddings.embed_documents(texts[start:end]))
+            try:
+                save_index(index_path, key, texts, metadatas, vectors)
+            except (OSError, ValueError) as e:
+                print(f"Error saving embedding index: {e}")
         
-        try:
-            results = self.rag_chain.invoke({"input": input_text})
-            return results['answer']
-        except Exception as e:
-            return f"Error getting hint: {str(e)}"
-    
-    def get_hint_with_position(self, current_board, solution_board):
-        """Get a hint with specific position and value from the AI"""
-        # Find the first empty cell that can be filled
-        for row in range(9):
-            for col in range(9):
-                if current_board[row][col] is None:
-                    correct_value = solution_board[row][col]
-                    if correct_value is not None:
-                        # Get explanation from AI
-                        input_text = f"Analyze this Sudoku puzzle state: {current_board}\n\nI'm looking at the cell in row {row+1}, column {col+1}. Walk me through the logical reasoning for what number should go there using standard Sudoku solving techniques. At the end, you can verify that {correct_value} is indeed the correct answer."
-                        
-                        try:
-                            results = self.rag_chain.invoke({"input": input_text})
-                            explanation = results['answer']
-                            
-                            return {
-                                'row': row,
-                                'col': col,
-                                'value': correct_value,
-                                'explanation': explanation
-                            }
-                        except Exception as e:
-                            return {
-                                'row': row,
-                                'col': col,
-                                'value': correct_value,
-                                'explanation': f"Place {correct_value} here. Error getting detailed explanation: {str(e)}"
-                            }
+        # Adding the passages replays their known vectors instead of re-embedding
+        vectorstore = InMemoryVectorStore(embedding=SavedEmbeddings(embeddings, texts, vectors))
+        vectorstore.add_texts(texts, metadatas=metadatas)
+        return vectorstore
+    
+    def stream(self, input_text):
+        """Yield the answer to a prompt piece by piece as the model generates it"""
+        for chunk in self.rag_chain.stream({"input": input_text}):
+            answer = chunk.get('answer')
+            if answer:
+                yield answer
+    
+    def cached_stream(self, kind, current_board, cell, value, extra, input_text, exact=False):
+        """Stream an answer, or replay a cached one given for this board or a symmetric variant
         
-        # If no empty cells found, return general hint
-        return self.get_hint(current_board, solution_board)
+        An answer is cached once it has streamed completely; with exact it is
+        only replayed for this very board.
+        """
+        key, symmetry = self.cache.key(kind, current_board, cell, value, extra)
+        answer = self.cache.get(key, symmetry)
+        if answer is not None:
+            yield answer
+            return
+        parts = []
+        for chunk in self.stream(input_text):
+            parts.append(chunk)
+            yield chunk
+        self.cache.put(key, symmetry, ''.join(parts), exact)
     
-    def chat(self, message, current_board=None, solution_board=None):
-        """General chat functionality with optional puzzle context"""
+    def _hint_input(self, current_board):
+        return f"Analyze this Sudoku puzzle and suggest the next logical move:\n\nCurrent state: {current_board}\n\nPlease identify the best next move and explain the reasoning using standard Sudoku techniques."
+    
+    def _position_input(self, current_board, row, col, value):
+        return f"Analyze this Sudoku puzzle state: {current_board}\n\nI'm looking at the cell in row {row+1}, column {col+1}. Walk me through the logical reasoning for what number should go there using standard Sudoku solving techniques. At the end, you can verify that {value} is indeed the correct answer."
+    
+    def _explain_input(self, current_board, row, col, value, technique=None):
+        technique_text = f" The move can be found with a {technique.replace('_', ' ')}." if technique else ""
+        return f"Analyze this Sudoku puzzle state: {current_board}\n\nThe next move is {value} in row {row+1}, column {col+1}.{technique_text} Walk me through the logical reasoning for this move step by step using standard Sudoku solving techniques."
+    
+    def _chat_input(self, message, current_board=None, solution_board=None):
         if current_board and solution_board:
-            context = f"Current Sudoku puzzle state: {current_board}\n\nUser question: {message}\n\nPlease help with this Sudoku-related question, providing guidance based on logical solving techniques."
-        else:
-            context = message
-            
-        try:
-            results = self.rag_chain.invoke({"input": context})
-            return results['answer']
-        except Exception as e:
-            return f"Error in chat: {str(e)}"
\ No newline at end of file
+            return f"Current Sudoku puzzle state: {current_board}\n\nUser question: {message}\n\nPlease help with this Sudoku-related question, providing guidance based on logical solving techniques."
+        return message
+    
+    def find_hint_move(self, current_board, solution_board):
+        """Return (row, col, value) for the first empty cell with a known answer, or None"""
+        for row in range(len(current_board)):
+            for col in range(len(current_board[row])):
+                if current_board[row][col] is None and solution_board[row][col] is not None:
+                    return row, col, solution_board[row][col]
+        return None
+    
+    # Answers stream as generators of chunks; errors propagate to the caller
+    
+    def hint_stream(self, current_board, move=None):
+        """Stream the explanation for a hint move, or a general hint if move is None"""
+        if move is None:
+            return self.cached_stream("hint", current_board, None, None, "", self._hint_input(current_board))
+        row, col, value = move
+        return self.cached_stream("position", current_board, (row, col), value, "",
+                                  self._position_input(current_board, row, col, value))
+    
+    def explain_hint_stream(self, current_board, row, col, value, technique=None):
+        """Stream an explanation of why a hinted value goes in a cell"""
+        return self.cached_stream("explain", current_board, (row, col), value, technique or "",
+                                  self._explain_input(current_board, row, col, value, technique))
+    
+    def chat_stream(self, message, current_board=None, solution_board=None):
+        """Stream a chat answer with optional puzzle context
+        
+        Answers about a board are cached for that exact board, keyed by the
+        message with case and spacing normalized; free text can't be safely
+        rewritten for a symmetric variant.
+        """
+        input_text = self._chat_input(message, current_board, solution_board)
+        if not (current_board and solution_board):
+            return self.stream(input_text)
+        normalized = ' '.join(message.split()).casefold()
+        return self.cached_stream("chat", current_board, None, None, normalized, input_text, exact=True)
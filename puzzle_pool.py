@@ -0,0 +1,124 @@
+"""
+Pre-generated puzzle pool
+
+Keeps a handful of ready (puzzle, solution) pairs per difficulty level so
+starting a new game is instant. A background worker refills a level once it
+drops below the low watermark, and the pool is saved to disk so it survives
+restarts.
+"""
+
+import json
+import random
+import threading
+from collections import deque
+from itertools import islice
+
+import generator
+from fileutil import write_atomic
+from logical_solver import grade
+from solver import from_string, to_string
+
+# Generator settings and accepted logical grades per difficulty level
+DIFFICULTY_LEVELS = {
+    "easy": (dict(target_clues=40), ("easy",)),
+    "medium": (dict(minimal=True), ("medium",)),
+    "difficult": (dict(minimal=True), ("difficult",)),
+}
+MAX_ATTEMPTS = 50
+
+
+def generate_puzzle(level, rng=None):
+    """Generate a (puzzle, solution) pair of 9x9 boards for a difficulty level
+
+    Candidates are graded by the techniques needed to solve them and
+    regenerated until the grade matches; after MAX_ATTEMPTS the last
+    candidate is used anyway.
+    """
+    settings, grades = DIFFICULTY_LEVELS[level]
+    for _ in range(MAX_ATTEMPTS):
+        puzzle, solution = generator.generate(rng=rng, **settings)
+        if grade(puzzle) in grades:
+            break
+    return puzzle, solution
+
+
+def is_valid_entry(entry):
+    """Check that a saved pool entry is a [puzzle, solution] pair of 81-character strings"""
+    return (isinstance(entry, (list, tuple)) and len(entry) == 2
+            and all(isinstance(grid, str) and len(grid) == 81 for grid in entry))
+
+
+class PuzzlePool:
+    """Thread-safe per-difficulty queues of puzzles, persisted as JSON"""
+
+    def __init__(self, path, capacity=10, low_watermark=3):
+        self.path = path
+        self.capacity = capacity
+        self.low_watermark = low_watermark
+        self._lock = threading.Lock()
+        self._pools = {level: deque() for level in DIFFICULTY_LEVELS}
+        self.load()
+
+    def load(self):
+        """Load saved puzzles from disk, ignoring a missing or corrupt file"""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return
+        if not isinstance(data, dict):
+            return
+        with self._lock:
+            for level, entries in data.items():
+                if level in self._pools and isinstance(entries, list):
+                    self._pools[level] = deque(islice(
+                        ((entry[0], entry[1]) for entry in entries if is_valid_entry(entry)),
+                        self.capacity))
+
+    def save(self):
+        """Write the pool to disk atomically"""
+        with self._lock:
+            data = {level: list(pool) for level, pool in self._pools.items()}
+        try:
+            write_atomic(self.path, json.dumps(data).encode('utf-8'))
+        except IOError as e:
+            print(f"Error saving puzzle pool: {e}")
+
+    def size(self, level):
+        """Number of ready puzzles for a level"""
+        with self._lock:
+            return len(self._pools[level])
+
+    def needs_refill(self, level=None):
+        """Check if a level (or any level) is below the low watermark"""
+        levels = [level] if level else list(self._pools)
+        return any(self.size(lvl) < self.low_watermark for lvl in levels)
+
+    def push(self, level, puzzle, solution):
+        """Add a generated puzzle to a level"""
+        with self._lock:
+            self._pools[level].append((to_string(puzzle), to_string(solution)))
+
+    def pop(self, level):
+        """Take the oldest puzzle for a level as (puzzle, solution) boards, or None if empty"""
+        with self._lock:
+            if not self._pools[level]:
+                return None
+            puzzle, solution = self._pools[level].popleft()
+        return from_string(puzzle), from_string(solution)
+
+    def refill(self, should_stop=lambda: False, rng=None):
+        """Top up every level below the watermark to full capacity
+
+        Intended to run on a worker thread; should_stop is polled between
+        puzzles so the worker can exit promptly.
+        """
+        rng = rng or random.Random()
+        for level in self._pools:
+            if self.size(level) >= self.low_watermark:
+                continue
+            while self.size(level) < self.capacity:
+                if should_stop():
+                    return
+                self.push(level, *generate_puzzle(level, rng))
+            self.save()
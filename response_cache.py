@@ -0,0 +1,331 @@
+"""
+Cache of Arlo's answers, shared between symmetric boards
+
+Sudoku boards that differ only by relabeling digits, permuting bands (or
+rows within a band), permuting stacks (or columns within a stack), or
+transposing are the same puzzle. Answers are cached under a canonical
+form of the board: lines are ordered by relabel-invariant keys (filled
+counts, refined by the counts of the crossing lines), every arrangement
+of tied lines is tried up to a limit, and the smallest encoding with
+digits numbered by first appearance wins. Past the limit the form is
+still a valid key, just not shared by all variants, so ties can only cost
+hits, never give wrong answers.
+
+Answers are stored as templates in canonical coordinates: references such
+as "row 3", "columns 1 and 2", "box 5", "R4C7" and explicit values ("a 5",
+"digit 5", "value 5") are rewritten through the transform, and back through
+the inverse for the board asking. Any other number that could be a digit
+("step 2 of 3", "(1, 3)") makes the answer ambiguous, and it is then only
+served for the identical board, as are free-form answers stored exact. Numbered list items, ranges and counts
+such as "2 cells" are never digits. The cache is an LRU with a size cap,
+saved as JSON in the config directory. This module avoids Qt and langchain.
+"""
+
+import json
+import re
+import threading
+from collections import OrderedDict
+from itertools import groupby, islice, permutations, product
+from math import isqrt
+
+from fileutil import write_atomic
+
+MAX_ENTRIES = 500
+MAX_ORDERINGS = 1024  # Line arrangements tried per orientation
+SYMBOLS = "0123456789ABCDEFGHIJKLMNOP"
+VERSION = 2
+
+LINE_WORDS = {'r': 'row', 'c': 'column', 'b': 'box'}
+
+
+def _tied_orders(items, key):
+    """Orderings of items sorted by key, with every arrangement of equal keys"""
+    groups = [list(g) for _, g in groupby(sorted(items, key=key), key)]
+    for combo in product(*(permutations(g) for g in groups)):
+        yield [i for group in combo for i in group]
+
+
+def _line_orders(keys, box):
+    """Orderings of lines by key that keep each band (box_size lines) together"""
+    bands = [range(b * box, (b + 1) * box) for b in range(box)]
+    band_keys = [tuple(sorted(keys[i] for i in band)) for band in bands]
+    within = [list(_tied_orders(band, keys.__getitem__)) for band in bands]
+    for band_order in _tied_orders(range(box), band_keys.__getitem__):
+        for combo in product(*(within[b] for b in band_order)):
+            yield [i for part in combo for i in part]
+
+
+def _encode(grid, rows, cols):
+    """Encode a grid in the given line order, numbering digits by first appearance"""
+    labels = {}
+    out = []
+    for r in rows:
+        line = grid[r]
+        for c in cols:
+            v = line[c]
+            if v:
+                label = labels.get(v)
+                if label is None:
+                    label = labels[v] = len(labels) + 1
+                out.append(SYMBOLS[label])
+            else:
+                out.append('0')
+    return ''.join(out), labels
+
+
+class Symmetry:
+    """A board's transform into canonical form, and the canonical form itself"""
+
+    def __init__(self, size, transposed, rows, cols, labels, form, board):
+        self.size = size
+        self.box = isqrt(size)
+        self.transposed = transposed
+        self.rows = rows  # Canonical row i is grid row rows[i] (grid = transposed board if so)
+        self.cols = cols
+        self.row_pos = {r: i for i, r in enumerate(rows)}
+        self.col_pos = {c: i for i, c in enumerate(cols)}
+        # Digits missing from the board get the remaining labels in order
+        missing = [v for v in range(1, size + 1) if v not in labels]
+        labels = dict(labels)
+        for label, v in enumerate(missing, len(labels) + 1):
+            labels[v] = label
+        self.labels = labels
+        self.values = {label: v for v, label in labels.items()}
+        self.form = form
+        self.board = board  # Encoding of the board as given, for answers tied to it
+
+    def cell_to_canonical(self, row, col):
+        if self.transposed:
+            row, col = col, row
+        return self.row_pos[row], self.col_pos[col]
+
+    def cell_from_canonical(self, row, col):
+        row, col = self.rows[row], self.cols[col]
+        return (col, row) if self.transposed else (row, col)
+
+    def line_to_canonical(self, axis, index):
+        """Map a row ('r'), column ('c') or box ('b') index to (axis, index) in canonical form"""
+        if axis == 'b':
+            row, col = divmod(index, self.box)
+            row, col = self.cell_to_canonical(row * self.box, col * self.box)
+            return 'b', row // self.box * self.box + col // self.box
+        if self.transposed:
+            axis = 'c' if axis == 'r' else 'r'
+        return axis, self.row_pos[index] if axis == 'r' else self.col_pos[index]
+
+    def line_from_canonical(self, axis, index):
+        if axis == 'b':
+            row, col = divmod(index, self.box)
+            row, col = self.cell_from_canonical(row * self.box, col * self.box)
+            return 'b', row // self.box * self.box + col // self.box
+        index = self.rows[index] if axis == 'r' else self.cols[index]
+        if self.transposed:
+            axis = 'c' if axis == 'r' else 'r'
+        return axis, index
+
+    # Text templates: references are replaced by \x00-delimited canonical tokens
+
+    def template(self, text):
+        """Rewrite the board references in text into canonical tokens
+        
+        Returns (template, ambiguous); ambiguous is True if text contains a
+        number that may be a digit but couldn't be rewritten safely.
+        """
+        ambiguous = False
+        
+        def replace(m):
+            nonlocal ambiguous
+            start = m.start()
+            if m.group('rl'):
+                row, col = int(m.group('r')) - 1, int(m.group('c')) - 1
+                if not (0 <= row < self.size and 0 <= col < self.size):
+                    return m.group(0)
+                row, col = self.cell_to_canonical(row, col)
+                return f"\x00X{m.group('rl')}{m.group('cl')}{row},{col}\x00"
+            if m.group('word'):
+                word, nums = m.group('word'), m.group('nums')
+                numbers = [int(n) - 1 for n in re.findall(r'\d+', nums)]
+                if not all(0 <= n < self.size for n in numbers):
+                    return m.group(0)
+                lines = [self.line_to_canonical(_word_axis(word), n) for n in numbers]
+                indexes = ','.join(str(index) for _, index in lines)
+                separators = re.split(r'\d+', nums)[1:-1]
+                return f"\x00L{word}|{lines[0][0]}|{indexes}|{'|'.join(separators)}\x00"
+            if m.group('value'):
+                value = int(m.group('value'))
+                if 1 <= value <= self.size:
+                    return f"{m.group('vword')}\x00D{self.labels[value]}\x00"
+                return m.group(0)
+            number = int(m.group('number'))
+            end = m.end()
+            at_line_start = not text[text.rfind('\n', 0, start) + 1:start].strip()
+            if 1 <= number <= self.size and not (
+                    (at_line_start and text.startswith('.', end))  # Numbered list item
+                    or text[start - 1:start] in ('-', '\u2013') or text[end:end + 1] in ('-', '\u2013')
+                    or COUNT_RE.match(text, end)):
+                ambiguous = True
+            return m.group(0)
+
+        return TOKEN_RE.sub(replace, text.replace('\x00', '')), ambiguous
+
+    def render(self, template):
+        """Turn a canonical template back into text for this board"""
+        def replace(m):
+            body = m.group(1)
+            kind, body = body[0], body[1:]
+            if kind == 'X':
+                rl, cl = body[0], body[1]
+                row, col = (int(n) for n in body[2:].split(','))
+                row, col = self.cell_from_canonical(row, col)
+                return f"{rl}{row + 1}{cl}{col + 1}"
+            if kind == 'L':
+                word, axis, indexes, *separators = body.split('|')
+                parts = []
+                for i, index in enumerate(indexes.split(',')):
+                    actual_axis, index = self.line_from_canonical(axis, int(index))
+                    if i:
+                        parts.append(separators[i - 1])
+                    parts.append(str(index + 1))
+                return f"{_line_word(word, actual_axis)} {''.join(parts)}"
+            return str(self.values[int(body)])
+
+        return re.sub(r'\x00([^\x00]*)\x00', replace, template)
+
+
+def _word_axis(word):
+    word = word.lower()
+    return 'r' if word.startswith('row') else 'b' if word.startswith('box') else 'c'
+
+
+def _line_word(word, axis):
+    """Word for a line reference, switched between row and column if the axis changed"""
+    if _word_axis(word) == axis:
+        return word
+    lower = word.lower()
+    plural = lower.endswith('s')
+    if axis == 'c' and lower.startswith('col') and not lower.startswith('column'):
+        new = 'cols' if plural else 'col'  # Keep the abbreviation
+    else:
+        new = LINE_WORDS[axis] + ('s' if plural else '')
+    return new.capitalize() if word[0].isupper() else new
+
+
+COUNT_RE = re.compile(
+    r"\s+(?:cells?|candidates?|times|ways|steps?|options?|possibilit(?:y|ies)|places?|spots?"
+    r"|squares?|numbers?|digits?|rows|columns|boxes|more|left|remaining|empty|others?)\b",
+    re.IGNORECASE)
+
+TOKEN_RE = re.compile(
+    r"\b(?P<rl>[Rr])(?P<r>\d+)(?P<cl>[Cc])(?P<c>\d+)\b"
+    r"|\b(?P<word>rows?|columns?|cols?|box(?:es)?) "
+    r"(?P<nums>\d+(?:(?:\s*,\s*|\s+and\s+|\s+or\s+|\s*&\s*)\d+)*)\b"
+    r"|(?P<vword>\b(?:an?|digit|value|number|candidate) )(?P<value>\d+)(?![\w\-\u2013]|\.\d)"
+    r"|(?<![\w.])(?P<number>\d+)(?![\w]|\.\d)",
+    re.IGNORECASE)
+
+
+def canonical_form(rows):
+    """Return the Symmetry taking board rows (None or 0 for empty) to canonical form"""
+    grid = [[v or 0 for v in row] for row in rows]
+    size = len(grid)
+    box = isqrt(size)
+    best = None
+    for transposed in (False, True):
+        g = [list(col) for col in zip(*grid)] if transposed else grid
+        row_counts = [sum(1 for v in line if v) for line in g]
+        col_counts = [sum(1 for r in range(size) if g[r][c]) for c in range(size)]
+        row_keys = [(row_counts[r], tuple(sorted(col_counts[c] for c in range(size) if g[r][c])))
+                    for r in range(size)]
+        col_keys = [(col_counts[c], tuple(sorted(row_counts[r] for r in range(size) if g[r][c])))
+                    for c in range(size)]
+        row_orders = list(islice(_line_orders(row_keys, box), MAX_ORDERINGS))
+        col_orders = list(islice(_line_orders(col_keys, box), max(1, MAX_ORDERINGS // len(row_orders))))
+        for row_order, col_order in product(row_orders, col_orders):
+            form, labels = _encode(g, row_order, col_order)
+            if best is None or form < best[0]:
+                best = (form, transposed, row_order, col_order, labels)
+    form, transposed, row_order, col_order, labels = best
+    board = ''.join(SYMBOLS[v] for row in grid for v in row)
+    return Symmetry(size, transposed, row_order, col_order, labels, form, board)
+
+
+class ResponseCache:
+    """LRU cache of answers keyed by canonical board, prompt kind, target cell and value"""
+
+    def __init__(self, path, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        # Key -> [answer template, board it is tied to or None], most recently used last
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()  # Answers are stored from stream worker threads
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Error loading response cache: {e}")
+            return
+        if not isinstance(data, dict) or data.get('version') != VERSION:
+            return
+        entries = data.get('entries')
+        if not isinstance(entries, list):
+            return
+        for entry in entries:
+            if (isinstance(entry, list) and len(entry) == 2 and isinstance(entry[0], str)
+                    and isinstance(entry[1], list) and len(entry[1]) == 2
+                    and isinstance(entry[1][0], str) and isinstance(entry[1][1], (str, type(None)))):
+                self.entries[entry[0]] = entry[1]
+
+    def save(self):
+        data = json.dumps({'version': VERSION, 'entries': list(self.entries.items())})
+        try:
+            write_atomic(self.path, data.encode('utf-8'))
+        except OSError as e:
+            print(f"Error saving response cache: {e}")
+
+    def key(self, kind, rows, cell=None, value=None, extra=""):
+        """Return (key, symmetry) for a prompt about a board
+
+        cell is the (row, col) the prompt is about and value the digit, if
+        any; extra is other prompt text that doesn't depend on the board's
+        orientation or labels, such as a technique name.
+        """
+        symmetry = canonical_form(rows)
+        target = "%d,%d" % symmetry.cell_to_canonical(*cell) if cell else ""
+        label = str(symmetry.labels[value]) if value else ""
+        return '\n'.join((kind, symmetry.form, target, label, extra)), symmetry
+
+    def get(self, key, symmetry):
+        """Return the cached answer rewritten for the board, or None"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            template, board = entry
+            if board is not None and board != symmetry.board:
+                return None  # Ambiguous answer, only valid for the board it was given for
+            self.entries.move_to_end(key)
+        return symmetry.render(template)
+
+    def put(self, key, symmetry, text, exact=False):
+        """Store an answer given for the board symmetry was computed from
+
+        With exact the answer is stored as is and only served for that board.
+        """
+        with self._lock:
+            if exact:
+                template, ambiguous = text.replace('\x00', ''), True
+            else:
+                template, ambiguous = symmetry.template(text)
+            self.entries[key] = [template, symmetry.board if ambiguous else None]
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.save()
+
+    def __len__(self):
+        return len(self.entries)
@@ -90,6 +90,10 @@ class SettingsDialog(QDialog):
         self.show_key_checkbox.toggled.connect(self.toggle_key_visibility)
         layout.addWidget(self.show_key_checkbox)
         
+        # Start Arlo in the background when the app opens
+        self.warmup_checkbox = QCheckBox("Start Arlo when Super Sudoku opens")
+        layout.addWidget(self.warmup_checkbox)
+        
         # Status info
         self.status_label = QLabel()
         self.status_label.setStyleSheet("margin-top: 10px;")
@@ -166,6 +170,7 @@ class SettingsDialog(QDialog):
     
     def load_current_settings(self):
         """Load current settings into the dialog"""
+        self.warmup_checkbox.setChecked(config.get_ai_warmup())
         api_key = config.get_openai_api_key()
         if api_key:
             self.api_key_input.setText(api_key)
@@ -220,6 +225,7 @@ class SettingsDialog(QDialog):
             config.set_openai_api_key("")
             QMessageBox.information(self, "Settings Saved", "API key has been cleared.")
         
+        config.set_ai_warmup(self.warmup_checkbox.isChecked())
         self.accept()
     
     @staticmethod
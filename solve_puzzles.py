@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Super Sudoku Headless Solver
+
+Reads puzzles line by line from stdin or files and streams one result line
+per puzzle to stdout, without importing PyQt6 or langchain:
+
+    <puzzle> <solution> <status> <level>
+
+The puzzle is the normalized 81-character input ('0' for empty), status is
+solved, multiple (with --unique), unsolvable or invalid, and level is the
+logical grade (easy, medium, difficult, expert). Fields that don't apply are
+'-'. Only the first whitespace-separated field of each input line is read,
+so generate_puzzles.py output can be piped straight in.
+
+    cat puzzles.txt | python solve_puzzles.py --workers 8 > solved.txt
+
+With --workers, chunks of lines are solved in a process pool and written in
+input order; at most a few chunks per worker are in flight, so arbitrarily
+long streams run in constant memory.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from importer import normalize, validate
+from logical_solver import grade
+from solver import count, initial_state, solve_grid
+
+
+def solve_line(line, grade_level=True, unique=False):
+    """Solve one input line and return its output line"""
+    fields = line.split()
+    puzzle = normalize(fields[0]) if fields else None
+    if puzzle is None:
+        return f"{fields[0] if fields else '-'} - invalid -\n"
+    grid = [int(ch) for ch in puzzle]
+    if not validate(puzzle, None):
+        return f"{puzzle} - invalid -\n"
+
+    solution = solve_grid(grid)
+    if solution is None:
+        return f"{puzzle} - unsolvable -\n"
+    status = "solved"
+    if unique and count(*initial_state(grid), 2) > 1:
+        status = "multiple"
+    level = grade(grid) if grade_level else "-"
+    return f"{puzzle} {''.join(map(str, solution))} {status} {level}\n"
+
+
+def solve_chunk(task):
+    """Solve a chunk of lines; runs inside a worker process"""
+    lines, grade_level, unique = task
+    return [solve_line(line, grade_level, unique) for line in lines]
+
+
+def read_chunks(files, chunk_size):
+    """Yield lists of non-blank lines from the input files"""
+    for f in files:
+        lines = (line for line in f if line.strip())
+        while True:
+            chunk = list(islice(lines, chunk_size))
+            if not chunk:
+                break
+            yield chunk
+
+
+def solve_stream(chunks, workers, grade_level=True, unique=False):
+    """Yield output chunks in input order, solving in a process pool if workers > 1"""
+    if workers <= 1:
+        for chunk in chunks:
+            yield solve_chunk((chunk, grade_level, unique))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(solve_chunk, (chunk, grade_level, unique)))
+            # Bound the number of chunks in flight and keep output ordered
+            if len(pending) >= 4 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Solve and grade Sudoku puzzles from the command line.")
+    parser.add_argument('inputs', nargs='*', default=['-'],
+                        help="puzzle files, or - for stdin (default: -)")
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help="worker processes (default: 1, no pool)")
+    parser.add_argument('-c', '--chunk-size', type=int, default=1000,
+                        help="lines per work unit (default: 1000)")
+    parser.add_argument('--no-grade', action='store_true',
+                        help="skip logical grading for maximum throughput")
+    parser.add_argument('--unique', action='store_true',
+                        help="report puzzles with more than one solution as 'multiple'")
+    parser.add_argument('-q', '--quiet', action='store_true', help="don't report throughput")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main entry point"""
+    args = parse_args(argv)
+    files = [sys.stdin if path == '-' else open(path) for path in args.inputs]
+
+    start = time.perf_counter()
+    done = 0
+    try:
+        chunks = read_chunks(files, args.chunk_size)
+        for lines in solve_stream(chunks, args.workers, not args.no_grade, args.unique):
+            sys.stdout.writelines(lines)
+            done += len(lines)
+    except BrokenPipeError:
+        # Downstream closed the pipe (e.g. head); point stdout at devnull so
+        # the flush at interpreter exit doesn't fail again, and stop
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    finally:
+        for f in files:
+            if f is not sys.stdin:
+                f.close()
+    sys.stdout.flush()
+
+    wall = time.perf_counter() - start
+    if not args.quiet and wall > 0:
+        print(f"Solved {done} puzzles in {wall:.2f}s ({done / wall:.0f} puzzles/sec)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Bitmask constraint-propagation solver for 9x9 Sudoku
+
+Each empty cell keeps a 9-bit mask of its remaining candidates and each row,
+column and box keeps a mask of the digits already placed in it. Naked and
+hidden singles are propagated until nothing changes, then the search branches
+on the cell with the fewest candidates (minimum remaining values).
+"""
+
+SIZE = 9
+CELLS = SIZE * SIZE
+ALL_DIGITS = (1 << SIZE) - 1
+
+# Unit and peer tables, built once at import time
+ROWS = tuple(tuple(r * SIZE + c for c in range(SIZE)) for r in range(SIZE))
+COLS = tuple(tuple(r * SIZE + c for r in range(SIZE)) for c in range(SIZE))
+BOXES = tuple(
+    tuple((br + r) * SIZE + bc + c for r in range(3) for c in range(3))
+    for br in range(0, SIZE, 3) for bc in range(0, SIZE, 3)
+)
+UNITS = ROWS + COLS + BOXES
+ROW_OF = tuple(i // SIZE for i in range(CELLS))
+COL_OF = tuple(i % SIZE for i in range(CELLS))
+BOX_OF = tuple((i // SIZE) // 3 * 3 + (i % SIZE) // 3 for i in range(CELLS))
+PEERS = tuple(
+    tuple(sorted(set(ROWS[ROW_OF[i]] + COLS[COL_OF[i]] + BOXES[BOX_OF[i]]) - {i}))
+    for i in range(CELLS)
+)
+
+# Lookup tables for candidate masks
+POPCOUNT = tuple(bin(m).count("1") for m in range(1 << SIZE))
+DIGIT_OF_BIT = {1 << d: d + 1 for d in range(SIZE)}
+
+
+def bit(digit):
+    """Return the candidate bit for a digit 1-9"""
+    return 1 << (digit - 1)
+
+
+def mask_digits(mask):
+    """List the digits contained in a candidate mask"""
+    return [d + 1 for d in range(SIZE) if mask >> d & 1]
+
+
+def flatten(board):
+    """Convert a 9x9 board (None or 0 for empty) to a flat list of 81 ints"""
+    return [value or 0 for row in board for value in row]
+
+
+def unflatten(grid):
+    """Convert a flat list of 81 ints back to a 9x9 list of lists"""
+    return [list(grid[r * SIZE:(r + 1) * SIZE]) for r in range(SIZE)]
+
+
+def to_string(board):
+    """Format a 9x9 board as an 81-character string with '0' for empty cells"""
+    return "".join(str(value or 0) for value in flatten(board))
+
+
+def from_string(text):
+    """Parse an 81-character string ('0' or '.' for empty) into a 9x9 board with None for empty cells"""
+    return [[int(ch) if ch not in "0." else None for ch in text[r * SIZE:(r + 1) * SIZE]] for r in range(SIZE)]
+
+
+def initial_state(grid):
+    """Build (grid, candidates, singles) for a flat grid, or None if givens conflict"""
+    row_used = [0] * SIZE
+    col_used = [0] * SIZE
+    box_used = [0] * SIZE
+    for i, value in enumerate(grid):
+        if value:
+            b = bit(value)
+            r, c, x = ROW_OF[i], COL_OF[i], BOX_OF[i]
+            if (row_used[r] | col_used[c] | box_used[x]) & b:
+                return None
+            row_used[r] |= b
+            col_used[c] |= b
+            box_used[x] |= b
+
+    cands = [0] * CELLS
+    for i, value in enumerate(grid):
+        if not value:
+            cands[i] = ALL_DIGITS & ~(row_used[ROW_OF[i]] | col_used[COL_OF[i]] | box_used[BOX_OF[i]])
+            if not cands[i]:
+                return None
+    singles = [i for i in range(CELLS) if cands[i] and not cands[i] & (cands[i] - 1)]
+    return list(grid), cands, singles
+
+
+def assign(grid, cands, cell, digit, singles):
+    """Place a digit and remove it from all peers; return False on contradiction
+
+    Peers that are reduced to a single candidate are appended to ``singles``.
+    """
+    grid[cell] = digit
+    cands[cell] = 0
+    b = bit(digit)
+    for p in PEERS[cell]:
+        m = cands[p]
+        if m & b:
+            m &= ~b
+            if not m:
+                return False
+            cands[p] = m
+            if not m & (m - 1):
+                singles.append(p)
+    return True
+
+
+def propagate(grid, cands, singles):
+    """Apply naked and hidden singles until fixpoint; return False on contradiction"""
+    while True:
+        # Naked singles: cells with exactly one candidate left
+        while singles:
+            i = singles.pop()
+            m = cands[i]
+            if not m:
+                if not grid[i]:
+                    return False
+                continue
+            if not assign(grid, cands, i, DIGIT_OF_BIT[m], singles):
+                return False
+
+        # Hidden singles: digits with exactly one place left in a unit
+        for unit in UNITS:
+            once = twice = placed = 0
+            for i in unit:
+                m = cands[i]
+                if m:
+                    twice |= once & m
+                    once |= m
+                else:
+                    placed |= 1 << (grid[i] - 1)
+            if (once | placed) != ALL_DIGITS:
+                return False
+            hidden = once & ~twice
+            while hidden:
+                b = hidden & -hidden
+                hidden ^= b
+                for i in unit:
+                    if cands[i] & b:
+                        if not assign(grid, cands, i, DIGIT_OF_BIT[b], singles):
+                            return False
+                        break
+            if singles:
+                break
+        else:
+            return True
+
+
+def choose_cell(cands):
+    """Return the empty cell with the fewest candidates, or -1 if none is left"""
+    best = -1
+    best_count = SIZE + 1
+    for i in range(CELLS):
+        m = cands[i]
+        if m:
+            n = POPCOUNT[m]
+            if n < best_count:
+                best, best_count = i, n
+                if n == 2:
+                    break
+    return best
+
+
+def search(grid, cands, singles, rng=None):
+    """Depth-first search with MRV branching; return a solved flat grid or None
+
+    When rng is given the branch digits are tried in random order, which
+    makes the first solution of a sparse grid a random one.
+    """
+    if not propagate(grid, cands, singles):
+        return None
+
+    best = choose_cell(cands)
+    if best < 0:
+        return grid
+
+    digits = mask_digits(cands[best])
+    if rng is not None:
+        rng.shuffle(digits)
+    for digit in digits:
+        next_grid = grid[:]
+        next_cands = cands[:]
+        next_singles = []
+        if assign(next_grid, next_cands, best, digit, next_singles):
+            result = search(next_grid, next_cands, next_singles, rng)
+            if result is not None:
+                return result
+    return None
+
+
+def count(grid, cands, singles, limit):
+    """Count solutions below a state, stopping as soon as limit is reached"""
+    if not propagate(grid, cands, singles):
+        return 0
+
+    best = choose_cell(cands)
+    if best < 0:
+        return 1
+
+    total = 0
+    m = cands[best]
+    while m:
+        b = m & -m
+        m ^= b
+        next_grid = grid[:]
+        next_cands = cands[:]
+        next_singles = []
+        if assign(next_grid, next_cands, best, DIGIT_OF_BIT[b], next_singles):
+            total += count(next_grid, next_cands, next_singles, limit - total)
+            if total >= limit:
+                break
+    return total
+
+
+def solve_grid(grid, rng=None):
+    """Solve a flat grid of 81 ints (0 for empty); return the solved grid or None"""
+    state = initial_state(grid)
+    if state is None:
+        return None
+    return search(*state, rng=rng)
+
+
+def count_solutions(grid, limit=2):
+    """Count the solutions of a flat grid, giving up once limit is reached
+
+    With the default limit of 2 this is a uniqueness check that aborts on the
+    second solution instead of enumerating them all.
+    """
+    state = initial_state(grid)
+    if state is None:
+        return 0
+    return count(*state, limit)
+
+
+def solve(board):
+    """Solve a 9x9 board and return the solution as a 9x9 list of lists, or None"""
+    solution = solve_grid(flatten(board))
+    if solution is None:
+        return None
+    return unflatten(solution)
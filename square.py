@@ -1,13 +1,60 @@
-from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QFont
+from contextlib import contextmanager
+from itertools import product
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt, QRect, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QPainter, QPen, QRegion
 
-class Cell (QWidget):
-    cellSelected = pyqtSignal(int, int)
-    cellRightClicked = pyqtSignal(int, int)
-    
-    def __init__(self, num, row=0, col=0, is_given=True):
-        super().__init__()
+def format_value(value):
+    """Format a cell value for display; values above 9 use letters (A = 10)"""
+    if not value:
+        return ""
+    if value <= 9:
+        return str(value)
+    return chr(ord('A') + value - 10)
+
+# (background, text) colors per cell state
+ERROR_COLORS = (QColor("#FFEBEE"), QColor("#D32F2F"))  # Light red / red
+SELECTED_COLORS = (QColor("#E3F2FD"), QColor("#1976D2"))  # Light blue / blue
+HIGHLIGHT_COLORS = (QColor("#FFF3E0"), QColor("#F57C00"))  # Light orange / orange
+HINT_COLORS = (QColor("#E8F5E8"), QColor("#2E7D32"))  # Light green / green
+GIVEN_COLORS = (QColor("white"), QColor("#1976D2"))  # Blue for given
+USER_COLORS = (QColor("white"), QColor("#424242"))  # Gray for user
+BACKGROUND = QColor("#f0f0f0")
+LINE_COLOR = QColor("#333")
+THIN_LINE_COLOR = QColor("#999")
+
+def make_style(has_error, selected, highlighted, hint, given):
+    """Return (background, text color, bold) for a combination of cell states"""
+    if has_error:
+        colors = ERROR_COLORS
+    elif selected:
+        colors = SELECTED_COLORS
+    elif highlighted:
+        colors = HIGHLIGHT_COLORS
+    elif hint:
+        colors = HINT_COLORS
+    else:
+        colors = GIVEN_COLORS if given else USER_COLORS
+    return colors + (given or hint,)
+
+# Every state combination is precomputed and shared by all cells
+STYLES = {key: make_style(*key) for key in product((False, True), repeat=5)}
+
+_fonts = {}  # (point size, bold) -> QFont
+
+def cell_font(point_size, bold):
+    """Return a shared font for cell values, created once per size"""
+    font = _fonts.get((point_size, bold))
+    if font is None:
+        weight = QFont.Weight.Bold if bold else QFont.Weight.Normal
+        font = _fonts[(point_size, bold)] = QFont("Arial", point_size, weight)
+    return font
+
+class Cell:
+    """Display state of one square; drawn by the SudokuBoardView that owns it"""
+
+    def __init__(self, view, num, row=0, col=0, is_given=True):
+        self.view = view
         self.selected = False
         self.row = row
         self.col = col
@@ -16,103 +63,186 @@ class Cell (QWidget):
         self.has_error = False
         self.is_highlighted = False  # For number highlighting
         self.is_hint = False  # For AI hint cells
-        
-        layout = QVBoxLayout()
-        layout.setContentsMargins(0, 0, 0, 0)
-        
-        self.label = QLabel(str(num) if num != 0 else "")
-        self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        # Set font and styling
-        font = QFont("Arial", 16, QFont.Weight.Bold)
-        self.label.setFont(font)
-        
-        layout.addWidget(self.label)
-        self.setLayout(layout)
-        
-        self.setFixedSize(55, 55)
-        self.update_style()
-    
-    def setFixedSize(self, width, height):
-        """Override to update font size based on cell size"""
-        super().setFixedSize(width, height)
-        # Adjust font size based on cell size
-        font_size = max(12, min(width // 3, height // 3))
-        font = QFont("Arial", font_size, QFont.Weight.Bold)
-        self.label.setFont(font)
-    
-    def get_border_style(self):
-        """Get border style based on position in 3x3 grid"""
-        # Thick borders for outer edges of 3x3 boxes
-        top = "2px" if self.row % 3 == 0 else "0.5px"
-        bottom = "2px" if self.row % 3 == 2 else "0.5px" 
-        left = "2px" if self.col % 3 == 0 else "0.5px"
-        right = "2px" if self.col % 3 == 2 else "0.5px"
-        
-        return f"border-top: {top} solid #333; border-bottom: {bottom} solid #333; border-left: {left} solid #333; border-right: {right} solid #333;"
-    
+        self.drawn = self.visual_state()  # State as of the last scheduled repaint
+
+    def style_key(self):
+        return (self.has_error, self.selected, self.is_highlighted, self.is_hint, self.is_given)
+
+    def style(self):
+        """Return the shared (background, text color, bold) style for the current state"""
+        return STYLES[self.style_key()]
+
+    def visual_state(self):
+        return (self.value,) + self.style_key()
+
     def update_style(self):
-        """Update cell styling"""
-        border_style = self.get_border_style()
-        
-        # Determine colors based on state
-        if self.has_error:
-            bg_color = "#FFEBEE"  # Light red for errors
-            text_color = "#D32F2F"  # Red
-        elif self.selected:
-            bg_color = "#E3F2FD"  # Light blue for selection
-            text_color = "#1976D2"  # Blue
-        elif self.is_highlighted:
-            bg_color = "#FFF3E0"  # Light orange for number highlighting
-            text_color = "#F57C00"  # Orange
-        elif self.is_hint:
-            bg_color = "#E8F5E8"  # Light green for AI hints
-            text_color = "#2E7D32"  # Green
-        else:
-            bg_color = "white"
-            text_color = "#1976D2" if self.is_given else "#424242"  # Blue for given, gray for user
-        
-        style = f"""
-            QWidget {{
-                {border_style}
-                background-color: {bg_color};
-            }}
-            QLabel {{
-                color: {text_color};
-                font-weight: {'bold' if (self.is_given or self.is_hint) else 'normal'};
-            }}
-        """
-        self.setStyleSheet(style)
-    
-    def mousePressEvent(self, event):
-        if event.button() == Qt.MouseButton.LeftButton:
-            self.cellSelected.emit(self.row, self.col)
-        elif event.button() == Qt.MouseButton.RightButton:
-            # Emit right-click signal for erasing
-            self.cellRightClicked.emit(self.row, self.col)
-    
+        """Schedule a repaint of this cell if anything visible changed"""
+        state = self.visual_state()
+        if state != self.drawn:
+            self.drawn = state
+            self.view.update_cell(self.row, self.col)
+
     def set_selected(self, selected):
         self.selected = selected
         self.update_style()
-    
+
     def set_value(self, value, is_user_input=True):
         self.value = value
         if is_user_input:
             self.is_given = False
-        self.label.setText(str(value) if value != 0 else "")
         self.update_style()
-    
+
     def set_error(self, has_error):
         """Set error state for the cell"""
         self.has_error = has_error
         self.update_style()
-    
+
     def set_highlighted(self, highlighted):
         """Set number highlighting state"""
         self.is_highlighted = highlighted
         self.update_style()
-    
+
     def set_hint(self, is_hint):
         """Set hint state for the cell"""
         self.is_hint = is_hint
-        self.update_style()
\ No newline at end of file
+        self.update_style()
+
+class SudokuBoardView(QWidget):
+    """Whole board drawn in one paintEvent, with arithmetic hit-testing
+
+    Cells are plain state objects; changing one repaints just its square
+    (and only if its visible state changed), and Qt merges pending updates
+    into a single paint pass.
+    """
+    cellSelected = pyqtSignal(int, int)
+    cellRightClicked = pyqtSignal(int, int)
+
+    MARGIN = 5  # Pixels around the grid
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.board_size = 9
+        self.box_size = 3
+        self.cells = []
+        self.cell_size = 1
+        self.batch_depth = 0
+        self.dirty = QRegion()  # Cells changed during a batch
+        self.thin_pen = QPen(THIN_LINE_COLOR, 1)
+        self.box_pen = QPen(LINE_COLOR, 2)
+        self.border_pen = QPen(LINE_COLOR, 3)
+        self.given_font = cell_font(16, True)
+        self.user_font = cell_font(16, False)
+
+    def load(self, board):
+        """Create cell states for a Board and repaint everything"""
+        self.board_size = board.size
+        self.box_size = board.box_size
+        self.cells = []
+        for i in range(board.size):
+            row = []
+            for j in range(board.size):
+                cell = Cell(self, board.get(i, j), i, j, board.is_given(i, j))
+                cell.is_hint = board.is_hint(i, j)
+                row.append(cell)
+            self.cells.append(row)
+        self.update_metrics()
+        self.update()
+
+    def update_metrics(self):
+        """Recompute the cell size and fonts for the current widget size"""
+        grid_size = min(self.width(), self.height()) - 2 * self.MARGIN
+        self.cell_size = max(1, grid_size // self.board_size)
+        font_size = max(8, self.cell_size // 3)
+        self.given_font = cell_font(font_size, True)
+        self.user_font = cell_font(font_size, False)
+
+    def cell_rect(self, row, col):
+        """Rectangle covered by a cell, in widget coordinates"""
+        return QRect(self.MARGIN + col * self.cell_size, self.MARGIN + row * self.cell_size,
+                     self.cell_size, self.cell_size)
+
+    def cell_at(self, x, y):
+        """Return (row, col) under a point, or None outside the grid"""
+        col = (x - self.MARGIN) // self.cell_size
+        row = (y - self.MARGIN) // self.cell_size
+        if 0 <= row < self.board_size and 0 <= col < self.board_size:
+            return int(row), int(col)
+        return None
+
+    def update_cell(self, row, col):
+        """Schedule a repaint of one cell (plus its border lines)"""
+        rect = self.cell_rect(row, col).adjusted(-2, -2, 2, 2)
+        if self.batch_depth:
+            self.dirty += rect
+        else:
+            self.update(rect)
+
+    @contextmanager
+    def batch(self):
+        """Collect cell changes and schedule them as one repaint of the changed region"""
+        self.batch_depth += 1
+        try:
+            yield
+        finally:
+            self.batch_depth -= 1
+            if not self.batch_depth and not self.dirty.isEmpty():
+                self.update(self.dirty)
+                self.dirty = QRegion()
+
+    def resizeEvent(self, event):
+        self.update_metrics()
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        region = event.region()
+        dirty = region.boundingRect()
+        painter.fillRect(dirty, BACKGROUND)
+        if not self.cells:
+            return
+
+        # Only cells inside the dirty region are drawn
+        size, cs, m = self.board_size, self.cell_size, self.MARGIN
+        first_row = max(0, (dirty.top() - m) // cs)
+        last_row = min(size - 1, (dirty.bottom() - m) // cs)
+        first_col = max(0, (dirty.left() - m) // cs)
+        last_col = min(size - 1, (dirty.right() - m) // cs)
+
+        for i in range(first_row, last_row + 1):
+            for j in range(first_col, last_col + 1):
+                rect = self.cell_rect(i, j)
+                if not region.intersects(rect):
+                    continue
+                cell = self.cells[i][j]
+                background, text, bold = cell.style()
+                painter.fillRect(rect, background)
+                if cell.value:
+                    painter.setPen(text)
+                    painter.setFont(self.given_font if bold else self.user_font)
+                    painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, format_value(cell.value))
+
+        # Grid lines: thin between cells, thicker around boxes and the board
+        end = m + size * cs
+        painter.setPen(self.thin_pen)
+        for k in range(1, size):
+            if k % self.box_size:
+                painter.drawLine(m + k * cs, m, m + k * cs, end)
+                painter.drawLine(m, m + k * cs, end, m + k * cs)
+        painter.setPen(self.box_pen)
+        for k in range(self.box_size, size, self.box_size):
+            painter.drawLine(m + k * cs, m, m + k * cs, end)
+            painter.drawLine(m, m + k * cs, end, m + k * cs)
+        painter.setPen(self.border_pen)
+        painter.drawRect(m, m, size * cs, size * cs)
+
+    def mousePressEvent(self, event):
+        position = event.position()
+        hit = self.cell_at(int(position.x()), int(position.y()))
+        if hit is None:
+            return
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.cellSelected.emit(*hit)
+        elif event.button() == Qt.MouseButton.RightButton:
+            # Emit right-click signal for erasing
+            self.cellRightClicked.emit(*hit)